@@ -1,6 +1,12 @@
 from src.esv_api.audio import Audio
+from src.esv_api.breaker import CircuitBreaker, CircuitOpen
+from src.esv_api.cache import PassageCache, train_dictionary
+from src.esv_api.crossref import CrossrefBuilder, CrossrefGraph
+from src.esv_api.formatter import TextFormatter
 from src.esv_api.html import HTML
-from src.esv_api.passage import PassageInvalid, PassageNotFound
+from src.esv_api.key_pool import KeyPool
+from src.esv_api.passage import DegradedPassage, PassageInvalid, PassageNotFound
+from src.esv_api.response import LazyResponse
 from src.esv_api.search import Search, SearchInvalid, SearchError
 from src.esv_api.text import Text
 
@@ -13,6 +19,29 @@ Search
 
 Text
 
+# Responses
+LazyResponse
+
+# Formatting
+TextFormatter
+
+# Cross-references
+CrossrefBuilder
+
+CrossrefGraph
+
+# Caching
+PassageCache
+
+train_dictionary
+
+# Resilience
+CircuitBreaker
+
+KeyPool
+
+DegradedPassage
+
 # Exceptions
 PassageInvalid
 
@@ -21,3 +50,5 @@ PassageNotFound
 SearchInvalid
 
 SearchError
+
+CircuitOpen
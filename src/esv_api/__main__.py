@@ -0,0 +1,95 @@
+########################################################################
+# Command line entry point for the esv_api package.
+#
+# Usage (from the root of the repository):
+#   python -m src.esv_api export OUTPUT [options]
+########################################################################
+from argparse import ArgumentParser, Namespace
+from src.esv_api.crossref import CrossrefBuilder
+from src.esv_api.export import Exporter
+from src.esv_api.html import HTML
+from src.esv_api.key_pool import KeyPool
+from src.esv_api.passage import PassageInvalid, PassageNotFound
+from src.esv_api.text import Text
+from typing import List, Optional, Union
+import sys
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Namespace:
+    """
+    :param argv: command line arguments (defaults to ``sys.argv``)
+    :return: the parsed arguments
+    """
+    parser = ArgumentParser(prog="python -m src.esv_api", description="Tools for the ESV API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="export the whole canon (or some books) chapter by chapter",
+                                 description="Exports chapters of the ESV, one record per chapter. Progress is "
+                                             "checkpointed, so running the same command again resumes an "
+                                             "interrupted export.")
+    export.add_argument("output", help="file to write the records to")
+    export.add_argument("--key", action="append", default=[],
+                        help="ESV API key. Give more than once to spread requests across several keys.")
+    export.add_argument("--key-file", default="api-key.txt",
+                        help="file to read the API key from if no --key is given (default: api-key.txt)")
+    export.add_argument("--content", choices=["text", "html", "both"], default="text",
+                        help="export Text.get_chapter_json output, HTML.get_passage output, or both (default: text)")
+    export.add_argument("--format", choices=Exporter.FORMATS, default="ndjson", dest="output_format",
+                        help="one JSON record per line, or length-prefixed zlib compressed records (default: ndjson)")
+    export.add_argument("--checkpoint", help="file to keep progress in (default: OUTPUT.checkpoint)")
+    export.add_argument("--workers", type=int, default=1, help="chapters to fetch concurrently (default: 1)")
+    export.add_argument("--rate", type=float, default=60,
+                        help="maximum API requests per minute, across workers (default: 60, 0 for unlimited)")
+    export.add_argument("--crossrefs", action="store_true",
+                        help="include cross-reference links in the HTML, to build a graph from with "
+                             "CrossrefBuilder.add_export")
+    export.add_argument("--book", action="append", dest="books",
+                        help="book to export. Give more than once for several books (default: all)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    :param argv: command line arguments (defaults to ``sys.argv``)
+    :return: exit status
+    """
+    args: Namespace = parse_args(argv)
+
+    keys: List[str] = args.key
+    if not keys:
+        try:
+            with open(args.key_file, "r") as key_in:
+                keys = [key_in.read().strip()]
+        except OSError as error:
+            print("Can not read the API key from {}: {}. Give one with --key or --key-file."
+                  .format(args.key_file, error.strerror), file=sys.stderr)
+            return 2
+    api_key: Union[str, KeyPool] = KeyPool(keys) if len(keys) > 1 else keys[0]
+
+    text: Optional[Text] = Text(api_key) if args.content in ("text", "both") else None
+    html: Optional[HTML] = HTML(api_key) if args.content in ("html", "both") else None
+    for book in args.books or []:
+        if not (text or html).chapter_count(book):
+            print("Unknown book {}".format(book), file=sys.stderr)
+            return 2
+
+    exporter = Exporter(args.output, text, html,
+                        output_format=args.output_format,
+                        checkpoint=args.checkpoint,
+                        workers=args.workers,
+                        rate=args.rate,
+                        html_options=CrossrefBuilder.HTML_OPTIONS if args.crossrefs else None)
+    try:
+        exported: int = exporter.run(args.books)
+    except (PassageInvalid, PassageNotFound) as error:
+        print("Export stopped: {}. Run the same command again to resume.".format(error), file=sys.stderr)
+        return 1
+    except (FileExistsError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 2
+    print("Exported {} chapters to {}".format(exported, args.output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,7 @@
+from src.esv_api.key_pool import KeyPool
 from src.esv_api.method import Method
 from src.esv_api.passage import PassageInvalid, PassageNotFound
+from typing import Union
 import requests
 
 
@@ -7,12 +9,12 @@ class Audio(Method):
     """
     Get a link to the audio version of a passage from the ESV API
     """
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: Union[str, KeyPool]) -> None:
         """
-        :param api_key: ESV API key
+        :param api_key: ESV API key, or a pool of keys to spread requests across
         """
         super().__init__()
-        self.__API_KEY: str = api_key
+        self.__API_KEY: Union[str, KeyPool] = api_key
         self.__API_URL: str = 'https://api.esv.org/v3/passage/audio/'
 
     def get_passage(self, book: str, chapter: int, verse: int = None) -> str:
@@ -27,7 +29,6 @@ class Audio(Method):
         :raises PassageInvalid: for invalid passage queries.
         :raises PassageNotFound: for connection issues.
         """
-        headers: dict = {'Authorization': 'Token %s' % self.__API_KEY}
         verse = verse if verse else ""
         query: str = "{} {}".format(book, str(chapter) + (":" if verse else "") + str(verse))
         params = {'q': query}
@@ -36,7 +37,7 @@ class Audio(Method):
             raise PassageInvalid(f"{book} {chapter}")
 
         try:
-            response: str = requests.get(self.__API_URL, params=params, headers=headers).url
+            response: str = self._request(self.__API_URL, params, self.__API_KEY).url
             if response:
                 return response
             else:
@@ -0,0 +1,136 @@
+from collections import deque
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+
+class CircuitOpen(Exception):
+    """
+    Exception for when a request is not made because the circuit for its endpoint is open
+    """
+    def __init__(self, endpoint: str):
+        super().__init__("Circuit open for {}".format(endpoint))
+
+
+class CircuitBreaker(object):
+    """
+    Per-endpoint circuit breaker. Once enough recent calls to an endpoint fail or are slow, the circuit opens and calls
+    fail fast until ``open_duration`` has passed. Then a few probe calls are let through (half-open): if they succeed
+    the circuit closes again, otherwise it reopens.
+    """
+    CLOSED: str = "closed"
+    OPEN: str = "open"
+    HALF_OPEN: str = "half-open"
+
+    def __init__(self, failure_rate: float = 0.5,
+                 slow_call_rate: float = 0.5,
+                 slow_call_duration: float = 5.0,
+                 window: int = 20,
+                 min_calls: int = 5,
+                 open_duration: float = 30.0,
+                 half_open_calls: int = 1,
+                 timeout: Optional[float] = None) -> None:
+        """
+        :param failure_rate: fraction of failed calls in the window that opens the circuit
+        :param slow_call_rate: fraction of slow calls in the window that opens the circuit
+        :param slow_call_duration: seconds after which a call counts as slow
+        :param window: number of recent calls per endpoint to compute the rates over
+        :param min_calls: calls needed in the window before the circuit can open
+        :param open_duration: seconds the circuit stays open before probing the endpoint again
+        :param half_open_calls: number of probe calls let through while half-open
+        :param timeout: seconds to wait for the API before a call fails (defaults to twice ``slow_call_duration``, 0 to
+                        wait indefinitely). A hung call only counts as slow once it returns, so without a timeout
+                        it never opens the circuit.
+        """
+        self.__failure_rate: float = failure_rate
+        self.__slow_call_rate: float = slow_call_rate
+        self.__slow_call_duration: float = slow_call_duration
+        self.__window: int = window if window > 0 else 1
+        self.__min_calls: int = min(max(min_calls, 1), self.__window)
+        self.__open_duration: float = open_duration
+        self.__half_open_calls: int = half_open_calls if half_open_calls > 0 else 1
+        self.__timeout: Optional[float] = slow_call_duration * 2 if timeout is None else (timeout if timeout > 0
+                                                                                           else None)
+        self.__circuits: dict = {}
+        self.__lock: Lock = Lock()
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """
+        :return: seconds to wait for the API before a call fails, or None to wait indefinitely
+        """
+        return self.__timeout
+
+    def allow(self, endpoint: str) -> bool:
+        """
+        Checks whether a call to an endpoint may be made. Calls that are allowed must be followed by ``record``.
+        :param endpoint: URL of the endpoint
+        :return: True if the call may go ahead, False if it should fail fast
+        """
+        with self.__lock:
+            circuit: dict = self.__circuit(endpoint)
+            if circuit['state'] == self.OPEN:
+                if monotonic() - circuit['opened_at'] < self.__open_duration:
+                    return False
+                circuit['state'] = self.HALF_OPEN
+                circuit['probes'] = 0
+            if circuit['state'] == self.HALF_OPEN:
+                if circuit['probes'] >= self.__half_open_calls:
+                    return False
+                circuit['probes'] += 1
+            return True
+
+    def record(self, endpoint: str, success: bool, duration: float) -> None:
+        """
+        Records the outcome of a call to an endpoint
+        :param endpoint: URL of the endpoint
+        :param success: whether the call succeeded
+        :param duration: how long the call took in seconds
+        """
+        slow: bool = duration >= self.__slow_call_duration
+        with self.__lock:
+            circuit: dict = self.__circuit(endpoint)
+            if circuit['state'] == self.HALF_OPEN:
+                if success and not slow:
+                    circuit['state'] = self.CLOSED
+                    circuit['calls'].clear()
+                else:
+                    self.__open(circuit)
+                return
+
+            circuit['calls'].append((not success, slow))
+            calls: int = len(circuit['calls'])
+            if calls >= self.__min_calls:
+                failures: int = sum(1 for failed, _ in circuit['calls'] if failed)
+                slow_calls: int = sum(1 for _, was_slow in circuit['calls'] if was_slow)
+                if failures / calls >= self.__failure_rate or slow_calls / calls >= self.__slow_call_rate:
+                    self.__open(circuit)
+
+    def state(self, endpoint: str) -> str:
+        """
+        :param endpoint: URL of the endpoint
+        :return: the state of the endpoint's circuit: ``CircuitBreaker.CLOSED``, ``OPEN``, or ``HALF_OPEN``
+        """
+        with self.__lock:
+            circuit: dict = self.__circuit(endpoint)
+            if circuit['state'] == self.OPEN and monotonic() - circuit['opened_at'] >= self.__open_duration:
+                return self.HALF_OPEN
+            return circuit['state']
+
+    def __circuit(self, endpoint: str) -> dict:
+        """
+        Gets the circuit for an endpoint, making it if needed. The lock must be held.
+        :param endpoint: URL of the endpoint
+        :return: the circuit
+        """
+        if endpoint not in self.__circuits:
+            self.__circuits[endpoint] = {'state': self.CLOSED,
+                                         'calls': deque(maxlen=self.__window),
+                                         'opened_at': 0.0,
+                                         'probes': 0}
+        return self.__circuits[endpoint]
+
+    def __open(self, circuit: dict) -> None:
+        circuit['state'] = self.OPEN
+        circuit['opened_at'] = monotonic()
+        circuit['calls'].clear()
@@ -0,0 +1,289 @@
+from collections import Counter, OrderedDict
+from random import uniform
+from re import findall
+from threading import Lock, Thread
+from time import monotonic
+from typing import Callable, Iterable, Optional, Union
+from urllib.parse import urlencode
+import zlib
+
+
+def train_dictionary(samples: Iterable[Union[bytes, str]], size: int = 32768) -> bytes:
+    """
+    Trains a shared compression dictionary from sample API payloads. Passages are mostly the same markup, keys, and
+    phrases repeated, so the segments that show up in the most samples make the best dictionary.
+    :param samples: raw payloads (e.g. response bodies of ``HTML.get_passage``) to train on
+    :param size: maximum size of the dictionary in bytes (zlib only uses the last 32 KiB)
+    :return: the dictionary, usable as the ``dictionary`` parameter of ``PassageCache``
+    """
+    document_frequency: Counter = Counter()
+    for sample in samples:
+        if isinstance(sample, str):
+            sample = sample.encode("utf-8")
+        document_frequency.update(set(findall(rb'<[^<>]{1,256}>|"[^"\\]{1,64}":\s?|[^<\s"]{2,64}\s?', sample)))
+
+    # Segments only seen once do not help, and zlib finds the end of the dictionary cheapest, so the most valuable
+    # segments go last.
+    scored = sorted((count * len(segment), segment) for segment, count in document_frequency.items() if count > 1)
+    dictionary: bytearray = bytearray()
+    for _, segment in reversed(scored):
+        if len(dictionary) + len(segment) > size:
+            continue
+        dictionary[0:0] = segment
+    return bytes(dictionary)
+
+
+class CacheEntry(object):
+    """
+    A compressed payload in a ``PassageCache`` along with its expiry times and HTTP validators
+    """
+    __slots__ = ('compressed', 'size', 'soft_expiry', 'hard_expiry', 'etag', 'last_modified')
+
+    def __init__(self, compressed: bytes, size: int, soft_expiry: float, hard_expiry: float,
+                 etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        :param compressed: the compressed payload
+        :param size: size of the uncompressed payload
+        :param soft_expiry: monotonic time after which the entry is stale (0 for never)
+        :param hard_expiry: monotonic time after which the entry may no longer be served (0 for never)
+        :param etag: ``ETag`` header of the response, if any
+        :param last_modified: ``Last-Modified`` header of the response, if any
+        """
+        self.compressed: bytes = compressed
+        self.size: int = size
+        self.soft_expiry: float = soft_expiry
+        self.hard_expiry: float = hard_expiry
+        self.etag: Optional[str] = etag
+        self.last_modified: Optional[str] = last_modified
+
+    @property
+    def is_stale(self) -> bool:
+        return bool(self.soft_expiry) and monotonic() >= self.soft_expiry
+
+    @property
+    def is_expired(self) -> bool:
+        return bool(self.hard_expiry) and monotonic() >= self.hard_expiry
+
+    @property
+    def validators(self) -> dict:
+        """
+        :return: headers to make a conditional request revalidating this entry
+        """
+        headers: dict = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PassageCache(object):
+    """
+    In-memory cache for raw API payloads, kept compressed and only decompressed on access. Entries past their soft TTL
+    are stale: they are still served while being revalidated in the background. Entries past their hard TTL are not
+    served at all.
+    """
+    def __init__(self, dictionary: Optional[bytes] = None, level: int = 6, max_entries: int = 0,
+                 soft_ttl: float = 0, hard_ttl: float = 0, jitter: float = 0.1) -> None:
+        """
+        :param dictionary: shared compression dictionary, see ``train_dictionary``
+        :param level: zlib compression level (0-9)
+        :param max_entries: the maximum number of entries to keep (0 for unlimited). Least recently used entries are
+                            dropped first.
+        :param soft_ttl: seconds before an entry becomes stale (0 for never)
+        :param hard_ttl: seconds before an entry expires (0 for never)
+        :param jitter: fraction the TTLs are randomly varied by, so entries stored together do not expire together
+        """
+        self.__dictionary: bytes = dictionary if dictionary else b''
+        self.__level: int = level
+        self.__max_entries: int = max_entries if max_entries >= 0 else 0
+        self.__soft_ttl: float = soft_ttl if soft_ttl > 0 else 0
+        self.__hard_ttl: float = hard_ttl if hard_ttl > 0 else 0
+        self.__jitter: float = min(max(jitter, 0.0), 1.0)
+        self.__entries: OrderedDict = OrderedDict()
+        self.__revalidating: set = set()
+        self.__lock: Lock = Lock()
+        self.__raw_bytes: int = 0
+        self.__compressed_bytes: int = 0
+        self.__hits: int = 0
+        self.__stale_hits: int = 0
+        self.__misses: int = 0
+        self.__revalidations: int = 0
+
+    @staticmethod
+    def make_key(url: str, params: dict) -> str:
+        """
+        Makes a cache key for a request
+        :param url: URL of the API endpoint
+        :param params: query parameters of the request
+        :return: the cache key
+        """
+        return url + '?' + urlencode(sorted(params.items()))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Gets a payload from the cache, stale or not
+        :param key: cache key, see ``make_key``
+        :return: the decompressed payload or None if it is not cached or has expired
+        """
+        entry: Optional[CacheEntry] = self.lookup(key)
+        return self.decompress(entry) if entry is not None else None
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """
+        Looks up an entry without decompressing it
+        :param key: cache key, see ``make_key``
+        :return: the entry or None if it is not cached or has expired
+        """
+        with self.__lock:
+            entry: Optional[CacheEntry] = self.__entries.get(key)
+            if entry is None or entry.is_expired:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            if entry.is_stale:
+                self.__stale_hits += 1
+            else:
+                self.__hits += 1
+            return entry
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """
+        Gets an entry even if it has expired, without counting a hit or miss
+        :param key: cache key, see ``make_key``
+        :return: the entry or None if it is not cached
+        """
+        with self.__lock:
+            return self.__entries.get(key)
+
+    def decompress(self, entry: CacheEntry) -> bytes:
+        """
+        :param entry: entry from ``lookup`` or ``peek``
+        :return: the decompressed payload of the entry
+        """
+        if self.__dictionary:
+            decompressor = zlib.decompressobj(zdict=self.__dictionary)
+        else:
+            decompressor = zlib.decompressobj()
+        return decompressor.decompress(entry.compressed) + decompressor.flush()
+
+    def put(self, key: str, payload: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Compresses and stores a payload in the cache
+        :param key: cache key, see ``make_key``
+        :param payload: raw payload to store
+        :param etag: ``ETag`` header of the response, for revalidation
+        :param last_modified: ``Last-Modified`` header of the response, for revalidation
+        """
+        compressed: bytes = self.__compress(payload)
+        soft_expiry, hard_expiry = self.__expiry()
+        with self.__lock:
+            self.__remove(key)
+            self.__entries[key] = CacheEntry(compressed, len(payload), soft_expiry, hard_expiry, etag, last_modified)
+            self.__raw_bytes += len(payload)
+            self.__compressed_bytes += len(compressed)
+            while self.__max_entries and len(self.__entries) > self.__max_entries:
+                self.__remove(next(iter(self.__entries)))
+
+    def refresh(self, key: str) -> None:
+        """
+        Restarts the TTLs of an entry, e.g. after the API answered a conditional request with ``304 Not Modified``
+        :param key: cache key, see ``make_key``
+        """
+        soft_expiry, hard_expiry = self.__expiry()
+        with self.__lock:
+            entry: Optional[CacheEntry] = self.__entries.get(key)
+            if entry is not None:
+                entry.soft_expiry = soft_expiry
+                entry.hard_expiry = hard_expiry
+
+    def revalidate(self, key: str, fetch: Callable[[], object]) -> bool:
+        """
+        Revalidates an entry in a background thread. Only one revalidation per key runs at a time.
+        :param key: cache key, see ``make_key``
+        :param fetch: function that fetches the entry again and stores (or refreshes) it
+        :return: True if a revalidation was started, False if one was already running
+        """
+        with self.__lock:
+            if key in self.__revalidating:
+                return False
+            self.__revalidating.add(key)
+            self.__revalidations += 1
+
+        def run() -> None:
+            try:
+                fetch()
+            except Exception:
+                # The stale entry keeps being served until a later revalidation succeeds or it expires.
+                pass
+            finally:
+                with self.__lock:
+                    self.__revalidating.discard(key)
+
+        Thread(target=run, name="esv-api-revalidate", daemon=True).start()
+        return True
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache (the hit and miss counts are kept)
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__raw_bytes = 0
+            self.__compressed_bytes = 0
+
+    @property
+    def stats(self) -> dict:
+        """
+        :return: Dict['entries': int,
+                      'raw_bytes': int,
+                      'compressed_bytes': int,
+                      'ratio': float (compressed / raw),
+                      'hits': int,
+                      'stale_hits': int,
+                      'misses': int,
+                      'revalidations': int]
+        """
+        with self.__lock:
+            return {'entries': len(self.__entries),
+                    'raw_bytes': self.__raw_bytes,
+                    'compressed_bytes': self.__compressed_bytes,
+                    'ratio': self.__compressed_bytes / self.__raw_bytes if self.__raw_bytes else 0.0,
+                    'hits': self.__hits,
+                    'stale_hits': self.__stale_hits,
+                    'misses': self.__misses,
+                    'revalidations': self.__revalidations}
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__entries
+
+    def __remove(self, key: str) -> None:
+        """
+        Removes an entry and its size from the totals. The lock must be held.
+        :param key: cache key of the entry
+        """
+        entry: Optional[CacheEntry] = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__compressed_bytes -= len(entry.compressed)
+            self.__raw_bytes -= entry.size
+
+    def __expiry(self) -> tuple:
+        """
+        :return: jittered (soft, hard) expiry times for an entry stored now
+        """
+        now: float = monotonic()
+        soft: float = now + self.__soft_ttl * uniform(1 - self.__jitter, 1 + self.__jitter) if self.__soft_ttl else 0
+        hard: float = now + self.__hard_ttl * uniform(1 - self.__jitter, 1 + self.__jitter) if self.__hard_ttl else 0
+        if soft and hard:
+            soft = min(soft, hard)
+        return soft, hard
+
+    def __compress(self, payload: bytes) -> bytes:
+        if self.__dictionary:
+            compressor = zlib.compressobj(self.__level, zdict=self.__dictionary)
+        else:
+            compressor = zlib.compressobj(self.__level)
+        return compressor.compress(payload) + compressor.flush()
@@ -0,0 +1,349 @@
+from array import array
+from bisect import bisect_left
+from html import unescape
+from mmap import ACCESS_READ, mmap
+from os import fstat
+from re import compile as recompile, escape, sub
+from src.esv_api.export import Exporter, RateLimiter
+from src.esv_api.html import HTML
+from src.esv_api.method import Method
+from struct import calcsize, pack, unpack_from
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote_plus
+import sys
+
+
+class CrossrefBuilder(Method):
+    """
+    Collects cross-references from the HTML API into a ``CrossrefGraph`` file
+    """
+    # Cross-reference links are pointed here so they can be told apart from every other link in the HTML
+    CROSSREF_URL: str = "https://crossref.invalid/"
+    # ``HTML.get_passage`` arguments for chapters to collect cross-references from
+    HTML_OPTIONS: Dict[str, object] = {'include_crossrefs': True, 'crossref_url': CROSSREF_URL,
+                                       'include_footnotes': False, 'include_audio_link': False}
+
+    __VERSE_OR_CROSSREF = recompile(r'\bid="v(\d{8})-\d+"|<a\b[^>]*?\bhref="' + escape(CROSSREF_URL) + r'([^"]*)"')
+    # [book] chapter[:verse][-chapter_or_verse[:verse]]
+    __REFERENCE = recompile(r'^\s*((?:[1-3]\s*)?[A-Za-z][A-Za-z. ]*?)?\s*(\d+)(?::(\d+))?'
+                            r'(?:\s*[-–]\s*(\d+)(?::(\d+))?)?')
+    # Abbreviations used in ESV cross-references (without the dots), and some common alternatives
+    __ABBREVIATIONS: Dict[str, str] = {'gen': 'Genesis', 'ex': 'Exodus', 'exod': 'Exodus', 'lev': 'Leviticus',
+                                       'num': 'Numbers', 'deut': 'Deuteronomy', 'josh': 'Joshua', 'judg': 'Judges',
+                                       'ruth': 'Ruth', '1 sam': '1 Samuel', '2 sam': '2 Samuel', '1 kgs': '1 Kings',
+                                       '2 kgs': '2 Kings', '1 chr': '1 Chronicles', '1 chron': '1 Chronicles',
+                                       '2 chr': '2 Chronicles', '2 chron': '2 Chronicles', 'ezra': 'Ezra',
+                                       'neh': 'Nehemiah', 'esth': 'Esther', 'job': 'Job', 'ps': 'Psalm',
+                                       'pss': 'Psalm', 'psalms': 'Psalm', 'prov': 'Proverbs',
+                                       'eccles': 'Ecclesiastes', 'eccl': 'Ecclesiastes', 'song': 'Song of Solomon',
+                                       'song of sol': 'Song of Solomon', 'isa': 'Isaiah', 'jer': 'Jeremiah',
+                                       'lam': 'Lamentations', 'ezek': 'Ezekiel', 'dan': 'Daniel', 'hos': 'Hosea',
+                                       'joel': 'Joel', 'amos': 'Amos', 'obad': 'Obadiah', 'jonah': 'Jonah',
+                                       'mic': 'Micah', 'nah': 'Nahum', 'hab': 'Habakkuk', 'zeph': 'Zephaniah',
+                                       'hag': 'Haggai', 'zech': 'Zechariah', 'mal': 'Malachi', 'matt': 'Matthew',
+                                       'mark': 'Mark', 'luke': 'Luke', 'john': 'John', 'acts': 'Acts',
+                                       'rom': 'Romans', '1 cor': '1 Corinthians', '2 cor': '2 Corinthians',
+                                       'gal': 'Galatians', 'eph': 'Ephesians', 'phil': 'Philippians',
+                                       'col': 'Colossians', '1 thess': '1 Thessalonians', '2 thess': '2 Thessalonians',
+                                       '1 tim': '1 Timothy', '2 tim': '2 Timothy', 'titus': 'Titus',
+                                       'philem': 'Philemon', 'heb': 'Hebrews', 'james': 'James', 'jas': 'James',
+                                       '1 pet': '1 Peter', '2 pet': '2 Peter', '1 john': '1 John', '2 john': '2 John',
+                                       '3 john': '3 John', 'jude': 'Jude', 'rev': 'Revelation'}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__edges: Set[Tuple[int, int]] = set()
+        self.__fetched: Set[Tuple[str, int]] = set()
+
+    def __len__(self) -> int:
+        return len(self.__edges)
+
+    def add(self, source: int, target: int) -> None:
+        """
+        Adds a cross-reference
+        :param source: id of the verse the cross-reference is in
+        :param target: id of the verse it points to
+        """
+        if source != target:
+            self.__edges.add((source, target))
+
+    def add_html(self, passage: str) -> int:
+        """
+        Adds the cross-references in a passage from ``HTML.get_passage`` made with ``include_crossrefs=True`` and
+        ``crossref_url=CrossrefBuilder.CROSSREF_URL``
+        :param passage: one of the ``passages`` of the response
+        :return: the number of cross-references found
+        """
+        found: int = 0
+        source: Optional[int] = None
+        for match in self.__VERSE_OR_CROSSREF.finditer(passage):
+            if match.group(1):
+                source = int(match.group(1))
+            elif source is not None:
+                for target in self.parse_references(unquote_plus(unescape(match.group(2)))):
+                    self.add(source, target)
+                    found += 1
+        return found
+
+    def fetch(self, html: HTML, books: Optional[Iterable[str]] = None, rate: float = 60) -> int:
+        """
+        Fetches chapters from the HTML API and adds their cross-references. Each chapter is one request. Chapters this
+        builder has already fetched are skipped, so after an error, calling ``fetch`` again picks up where it stopped
+        (and ``write`` saves what has been collected so far). For a build that survives the process, export the
+        chapters with ``Exporter(..., html_options=CrossrefBuilder.HTML_OPTIONS)`` and use ``add_export``.
+        :param html: HTML client to fetch with
+        :param books: books to fetch (defaults to the whole canon)
+        :param rate: maximum requests per minute (0 for unlimited). The API allows 60 per minute for each key.
+        :return: the number of chapters fetched
+        :raises PassageInvalid: for invalid passage queries.
+        :raises PassageNotFound: for connection issues.
+        """
+        limiter: RateLimiter = RateLimiter(rate)
+        fetched: int = 0
+        for book in (books if books is not None else html.books_of_the_bible):
+            chapter_count: int = html.chapter_count(book)
+            for chapter in range(1, chapter_count + 1):
+                if (book, chapter) in self.__fetched:
+                    continue
+                # The API returns only the first verse of single chapter books when asked for chapter 1
+                query: str = book if chapter_count == 1 else "{} {}".format(book, chapter)
+                limiter.wait()
+                response: dict = html.get_passage(query, **self.HTML_OPTIONS)
+                for passage in response['passages']:
+                    self.add_html(passage)
+                self.__fetched.add((book, chapter))
+                fetched += 1
+        return fetched
+
+    def add_export(self, file_name: str, output_format: str = "ndjson") -> int:
+        """
+        Adds the cross-references of the chapters in an export made with ``html_options=CrossrefBuilder.HTML_OPTIONS``
+        :param file_name: file written by ``Exporter.run``
+        :param output_format: "ndjson" or "binary"
+        :return: the number of chapters added
+        """
+        added: int = 0
+        for record in Exporter.read(file_name, output_format):
+            if 'html' not in record:
+                continue
+            for passage in record['html']['passages']:
+                self.add_html(passage)
+            self.__fetched.add((record['book'], record['chapter']))
+            added += 1
+        return added
+
+    def parse_references(self, references: str) -> List[int]:
+        """
+        Parses references such as "Gen. 1:1-3; Ps. 33:6, 9; John 1:1-2:3; Jude 3" into verse ids. Books may be
+        abbreviated, and a reference without a book or chapter continues the one before it. Ranges into a later chapter
+        are expanded using the verse counts of the chapters. Chapter-only references are skipped; in books of a single
+        chapter a bare number is a verse.
+        :param references: the references, separated by ";" or ","
+        :return: the ids of the verses referenced
+        """
+        verse_ids: List[int] = []
+        book: Optional[str] = None
+        chapter: Optional[int] = None
+        for reference in references.strip().strip("/").replace("?q=", "").replace(",", ";").split(";"):
+            match = self.__REFERENCE.match(reference)
+            if match is None:
+                continue
+            name, first, first_verse, second, second_verse = match.groups()
+            if name and name.strip():
+                book = self.__book(name)
+                chapter = None
+                if book is not None and first_verse is None and self.chapter_count(book) == 1:
+                    # "Jude 3" is a verse, as single chapter books are cited without the chapter
+                    chapter = 1
+                elif first_verse is None:
+                    # "Ps. 23" is a whole chapter
+                    continue
+            if book is None:
+                continue
+
+            if first_verse is not None:
+                chapter = int(first)
+                start: int = int(first_verse)
+            elif chapter is not None:
+                # A bare verse continues the chapter before it
+                start = int(first)
+            else:
+                continue
+
+            end_chapter: int = chapter
+            end: int = start
+            if second is not None and second_verse is None:
+                end = int(second)
+            elif second_verse is not None:
+                end_chapter, end = int(second), int(second_verse)
+            if end_chapter < chapter or (end_chapter == chapter and end < start):
+                end_chapter, end = chapter, start
+
+            for range_chapter in range(chapter, end_chapter + 1):
+                last: int = end if range_chapter == end_chapter else self.verse_count(book, range_chapter)
+                verse_ids.extend(self.verse_id(book, range_chapter, verse)
+                                 for verse in range(start if range_chapter == chapter else 1, last + 1))
+            chapter = end_chapter
+        return verse_ids
+
+    def __book(self, name: str) -> Optional[str]:
+        """
+        :param name: a book name or abbreviation (e.g. "1 Cor.", "Psalms")
+        :return: the book's name as in ``books_of_the_bible``, or None if it is unknown
+        """
+        abbreviation: str = sub(r'^([1-3])(?=[a-z])', r'\1 ', " ".join(name.replace(".", " ").split()).lower())
+        if abbreviation in self.__ABBREVIATIONS:
+            return self.__ABBREVIATIONS[abbreviation]
+        for book in self.books_of_the_bible:
+            if book.lower().startswith(abbreviation) or abbreviation.startswith(book.lower()):
+                return book
+        return None
+
+    def write(self, file_name: str) -> None:
+        """
+        Writes the cross-references as a ``CrossrefGraph`` file
+        :param file_name: file to write to
+        """
+        ids: array = array('i', sorted({verse for edge in self.__edges for verse in edge}))
+        ordinals: Dict[int, int] = {verse: ordinal for ordinal, verse in enumerate(ids)}
+        forward: List[Tuple[int, int]] = sorted((ordinals[source], ordinals[target]) for source, target in self.__edges)
+        backward: List[Tuple[int, int]] = sorted((target, source) for source, target in forward)
+
+        arrays: List[array] = [ids]
+        for edges in (forward, backward):
+            indptr: array = array('i', [0] * (len(ids) + 1))
+            for source, _ in edges:
+                indptr[source + 1] += 1
+            for ordinal in range(len(ids)):
+                indptr[ordinal + 1] += indptr[ordinal]
+            arrays.extend([indptr, array('i', (target for _, target in edges))])
+
+        with open(file_name, "wb") as graph_out:
+            graph_out.write(pack(CrossrefGraph.HEADER, CrossrefGraph.MAGIC, CrossrefGraph.VERSION, len(ids),
+                                 len(self.__edges)))
+            for values in arrays:
+                if sys.byteorder != "little":
+                    values.byteswap()
+                graph_out.write(values.tobytes())
+
+
+class CrossrefGraph(object):
+    """
+    Memory-mapped cross-reference graph in CSR form: verses are numbered by their position in a sorted array of verse
+    ids, and each verse's (reverse) neighbours are a slice of one flat array of those ordinals. Opening the file reads
+    nothing but the header, and lookups do not use the network.
+    """
+    MAGIC: bytes = b'ESVX'
+    VERSION: int = 1
+    # magic, version, verse count, cross-reference count
+    HEADER: str = "<4sIII"
+
+    def __init__(self, file_name: str) -> None:
+        """
+        :param file_name: file written by ``CrossrefBuilder.write``
+        :raises ValueError: for files that are not cross-reference graphs.
+        """
+        with open(file_name, "rb") as graph_in:
+            if fstat(graph_in.fileno()).st_size < calcsize(self.HEADER):
+                raise ValueError("{} is not a cross-reference graph".format(file_name))
+            self.__map: mmap = mmap(graph_in.fileno(), 0, access=ACCESS_READ)
+        magic, version, verses, edges = unpack_from(self.HEADER, self.__map)
+        lengths: List[int] = [verses, verses + 1, edges, verses + 1, edges]
+        if magic != self.MAGIC or version != self.VERSION or len(self.__map) < calcsize(self.HEADER) + sum(lengths) * 4:
+            self.__map.close()
+            raise ValueError("{} is not a cross-reference graph".format(file_name))
+        # Views into the map, released on close
+        self.__views: List[memoryview] = [memoryview(self.__map)]
+        offset: int = calcsize(self.HEADER)
+        arrays: list = []
+        for length in lengths:
+            values: memoryview = self.__views[0][offset:offset + length * 4]
+            if sys.byteorder == "little":
+                self.__views.append(values)
+                self.__views.append(values.cast('i'))
+                arrays.append(self.__views[-1])
+            else:
+                swapped: array = array('i', values.tobytes())
+                swapped.byteswap()
+                arrays.append(swapped)
+                values.release()
+            offset += length * 4
+        self.__ids, self.__indptr, self.__indices, self.__rindptr, self.__rindices = arrays
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def __contains__(self, verse: int) -> bool:
+        return self.__ordinal(verse) is not None
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.__indices)
+
+    def neighbours(self, verse: int) -> List[int]:
+        """
+        :param verse: verse id (see ``Method.verse_id``)
+        :return: ids of the verses the verse cross-references
+        """
+        return self.__slice(verse, self.__indptr, self.__indices)
+
+    def reverse_neighbours(self, verse: int) -> List[int]:
+        """
+        :param verse: verse id (see ``Method.verse_id``)
+        :return: ids of the verses that cross-reference the verse
+        """
+        return self.__slice(verse, self.__rindptr, self.__rindices)
+
+    def k_hop(self, verse: int, k: int, reverse: bool = False) -> Set[int]:
+        """
+        :param verse: verse id (see ``Method.verse_id``)
+        :param k: maximum number of cross-references to follow
+        :param reverse: follow cross-references backwards
+        :return: ids of the verses reachable in at most k steps, not including the verse itself
+        """
+        start: Optional[int] = self.__ordinal(verse)
+        if start is None:
+            return set()
+        indptr, indices = (self.__rindptr, self.__rindices) if reverse else (self.__indptr, self.__indices)
+        seen: Set[int] = {start}
+        frontier: List[int] = [start]
+        for _ in range(k):
+            next_frontier: List[int] = []
+            for ordinal in frontier:
+                for neighbour in indices[indptr[ordinal]:indptr[ordinal + 1]]:
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        next_frontier.append(neighbour)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        seen.discard(start)
+        return {self.__ids[ordinal] for ordinal in seen}
+
+    def close(self) -> None:
+        """
+        Unmaps the file. The graph can not be used afterwards.
+        """
+        self.__ids = self.__indptr = self.__indices = self.__rindptr = self.__rindices = array('i')
+        for view in reversed(self.__views):
+            view.release()
+        self.__views = []
+        self.__map.close()
+
+    def __enter__(self) -> 'CrossrefGraph':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __ordinal(self, verse: int) -> Optional[int]:
+        ordinal: int = bisect_left(self.__ids, verse)
+        if ordinal < len(self.__ids) and self.__ids[ordinal] == verse:
+            return ordinal
+        return None
+
+    def __slice(self, verse: int, indptr, indices) -> List[int]:
+        ordinal: Optional[int] = self.__ordinal(verse)
+        if ordinal is None:
+            return []
+        return [self.__ids[neighbour] for neighbour in indices[indptr[ordinal]:indptr[ordinal + 1]]]
@@ -0,0 +1,213 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from json import dumps, loads
+from os import fsync, path
+from src.esv_api.html import HTML
+from src.esv_api.method import Method
+from src.esv_api.text import Text
+from struct import pack, unpack
+from threading import Lock
+from time import monotonic, sleep
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import zlib
+
+
+class RateLimiter(object):
+    """
+    Spaces out calls so no more than ``rate`` are made per minute, across threads
+    """
+    def __init__(self, rate: float) -> None:
+        """
+        :param rate: calls per minute (0 for unlimited)
+        """
+        self.__interval: float = 60.0 / rate if rate > 0 else 0.0
+        self.__next: float = 0.0
+        self.__lock: Lock = Lock()
+
+    def wait(self) -> None:
+        """
+        Blocks until the next call may be made
+        """
+        if not self.__interval:
+            return
+        with self.__lock:
+            now: float = monotonic()
+            start: float = max(now, self.__next)
+            self.__next = start + self.__interval
+        if start > now:
+            sleep(start - now)
+
+
+class Exporter(object):
+    """
+    Exports chapters of the ESV to a file, one record per chapter, as NDJSON or a compact binary format (each record is
+    a 4 byte big-endian length followed by the zlib compressed JSON). Progress is checkpointed after every record so an
+    interrupted export picks up where it stopped.
+    """
+    FORMATS: Tuple[str, ...] = ("ndjson", "binary")
+
+    def __init__(self, output: str,
+                 text: Optional[Text] = None,
+                 html: Optional[HTML] = None,
+                 output_format: str = "ndjson",
+                 checkpoint: Optional[str] = None,
+                 workers: int = 1,
+                 rate: float = 60,
+                 html_options: Optional[Dict[str, object]] = None) -> None:
+        """
+        :param output: file to write the records to
+        :param text: Text client, to include ``get_chapter_json`` output in each record (optional)
+        :param html: HTML client, to include ``get_passage`` output in each record (optional)
+        :param html_options: keyword arguments for ``HTML.get_passage`` (e.g. ``CrossrefBuilder.HTML_OPTIONS``)
+        :param output_format: "ndjson" or "binary"
+        :param checkpoint: file to keep progress in (defaults to the output file name with ".checkpoint" appended)
+        :param workers: number of chapters to fetch concurrently
+        :param rate: maximum API requests per minute, across all workers (0 for unlimited)
+        """
+        if text is None and html is None:
+            raise ValueError("Nothing to export: give a Text client, an HTML client, or both")
+        if output_format not in self.FORMATS:
+            raise ValueError("Unknown format {}, expected one of {}".format(output_format, ", ".join(self.FORMATS)))
+        self.__output: str = output
+        self.__text: Optional[Text] = text
+        self.__html: Optional[HTML] = html
+        self.__format: str = output_format
+        self.__checkpoint: str = checkpoint if checkpoint else output + ".checkpoint"
+        self.__workers: int = workers if workers > 0 else 1
+        self.__limiter: RateLimiter = RateLimiter(rate)
+        self.__html_options: Dict[str, object] = dict(html_options) if html_options else {}
+
+    @staticmethod
+    def read(file_name: str, output_format: str = "ndjson") -> Iterator[dict]:
+        """
+        Reads the records of an export. A record that was being written when the export stopped is skipped.
+        :param file_name: file written by ``run``
+        :param output_format: "ndjson" or "binary"
+        :return: the records, in the order they were written
+        """
+        with open(file_name, "rb") as records_in:
+            if output_format == "binary":
+                while True:
+                    header: bytes = records_in.read(4)
+                    if len(header) < 4:
+                        break
+                    length: int = unpack(">I", header)[0]
+                    compressed: bytes = records_in.read(length)
+                    if len(compressed) < length:
+                        break
+                    yield loads(zlib.decompress(compressed))
+            else:
+                for line in records_in:
+                    if not line.endswith(b"\n"):
+                        break
+                    yield loads(line)
+
+    def chapters(self, books: Optional[List[str]] = None) -> Iterator[Tuple[str, int]]:
+        """
+        :param books: books to export (defaults to the whole canon)
+        :return: (book, chapter) for every chapter of the given books, in canonical order
+        """
+        method: Method = self.__text if self.__text is not None else self.__html
+        for book, chapter_count in method.books_of_the_bible.items():
+            if books is None or book in books:
+                for chapter in range(1, chapter_count + 1):
+                    yield book, chapter
+
+    def run(self, books: Optional[List[str]] = None) -> int:
+        """
+        Runs (or resumes) the export. Records are written as soon as their chapter is fetched, so they are not
+        necessarily in canonical order, and at most a few chapters per worker are held in memory.
+        :param books: books to export (defaults to the whole canon)
+        :return: the number of chapters exported by this run
+        :raises PassageInvalid: for invalid passage queries.
+        :raises PassageNotFound: for connection issues. Progress up to that point is kept.
+        :raises FileExistsError: if the output is not empty but there is no checkpoint to resume from.
+        :raises ValueError: if the checkpoint does not match the output.
+        """
+        done: Set[Tuple[str, int]] = self.__resume()
+        remaining: Iterator[Tuple[str, int]] = (chapter for chapter in self.chapters(books) if chapter not in done)
+        exported: int = 0
+
+        with open(self.__output, "ab") as output, open(self.__checkpoint, "a", encoding="utf-8") as checkpoint, \
+                ThreadPoolExecutor(self.__workers) as executor:
+            pending: Set[Future] = set()
+            try:
+                while True:
+                    for book, chapter in remaining:
+                        pending.add(executor.submit(self.__fetch, book, chapter))
+                        if len(pending) >= self.__workers * 2:
+                            break
+                    if not pending:
+                        break
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        book, chapter, record = future.result()
+                        output.write(record)
+                        output.flush()
+                        fsync(output.fileno())
+                        checkpoint.write("{}\t{}\t{}\n".format(output.tell(), book, chapter))
+                        checkpoint.flush()
+                        exported += 1
+            finally:
+                for future in pending:
+                    future.cancel()
+        return exported
+
+    def __resume(self) -> Set[Tuple[str, int]]:
+        """
+        Reads the checkpoint and truncates the output to the end of the last checkpointed record, dropping any record
+        that was being written when the previous run stopped. A partially written last line of the checkpoint is
+        dropped too, so the next line is not appended to it.
+        :return: the chapters already exported
+        :raises FileExistsError: if the output is not empty but there is no checkpoint to resume from.
+        :raises ValueError: if the checkpoint records more output than there is.
+        """
+        done: Set[Tuple[str, int]] = set()
+        offset: int = 0
+        if not path.exists(self.__checkpoint):
+            if path.exists(self.__output) and path.getsize(self.__output):
+                raise FileExistsError("{} is not empty and has no checkpoint ({}) to resume from"
+                                      .format(self.__output, self.__checkpoint))
+            return done
+
+        with open(self.__checkpoint, "r+b") as checkpoint:
+            complete: bytes = checkpoint.read()
+            complete = complete[:complete.rfind(b"\n") + 1]
+            checkpoint.truncate(len(complete))
+        for line in complete.decode("utf-8").splitlines():
+            fields: List[str] = line.split("\t")
+            if len(fields) != 3 or not fields[0].isdigit() or not fields[2].isdigit():
+                raise ValueError("{} is not a checkpoint: {!r}".format(self.__checkpoint, line))
+            offset = max(offset, int(fields[0]))
+            done.add((fields[1], int(fields[2])))
+
+        size: int = path.getsize(self.__output) if path.exists(self.__output) else 0
+        if offset > size:
+            raise ValueError("{} records {} bytes of output, but {} has {}".format(self.__checkpoint, offset,
+                                                                                 self.__output, size))
+        if size:
+            with open(self.__output, "r+b") as output:
+                output.truncate(offset)
+        return done
+
+    def __fetch(self, book: str, chapter: int) -> Tuple[str, int, bytes]:
+        """
+        Fetches a chapter and encodes its record
+        :param book: Name of the book
+        :param chapter: The chapter to fetch
+        :return: the book, chapter, and encoded record
+        """
+        record: dict = {"book": book, "chapter": chapter}
+        if self.__text is not None:
+            self.__limiter.wait()
+            record["text"] = self.__text.get_chapter_json(book, chapter)
+        if self.__html is not None:
+            self.__limiter.wait()
+            # The API returns only the first verse of single chapter books when asked for chapter 1
+            query: str = book if self.__html.chapter_count(book) == 1 else "{} {}".format(book, chapter)
+            record["html"] = dict(self.__html.get_passage(query, **self.__html_options))
+
+        encoded: bytes = dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if self.__format == "binary":
+            compressed: bytes = zlib.compress(encoded)
+            return book, chapter, pack(">I", len(compressed)) + compressed
+        return book, chapter, encoded + b"\n"
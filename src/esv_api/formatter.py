@@ -0,0 +1,103 @@
+from re import sub
+from textwrap import wrap
+from typing import List
+
+
+class TextFormatter(object):
+    """
+    Lays out passages from the text API locally. A passage is fetched once with ``CANONICAL_PARAMS`` and can then be
+    rendered with any combination of the layout parameters, without another request.
+    """
+    # Every kind of line is fetched with a different number of leading tabs so it can be told apart: headings and
+    # passage references none, paragraphs 1, poetry 2 per level, Psalm doxologies 31, and "declares the LORD" 41.
+    CANONICAL_PARAMS: dict = {
+        'include-verse-numbers': True,
+        'include-passage-horizontal-lines': False,
+        'include-heading-horizontal-lines': False,
+        'indent-using': 'tab',
+        'indent-paragraphs': 1,
+        'indent-poetry': True,
+        'indent-poetry-lines': 2,
+        'indent-declares': 41,
+        'indent-psalm-doxology': 31,
+        'line-length': 0
+    }
+    # Parameters that only change the layout, not the words
+    LAYOUT_PARAMS: tuple = tuple(CANONICAL_PARAMS) + ('horizontal-line-length',)
+
+    __PARAGRAPH_TABS: int = 1
+    __DOXOLOGY_TABS: int = 31
+    __DECLARES_TABS: int = 41
+
+    @staticmethod
+    def render(passage: str, params: dict) -> str:
+        """
+        Renders a passage fetched with ``CANONICAL_PARAMS``
+        :param passage: one of the ``passages`` of the text API response
+        :param params: the text API parameters to render the passage with. Uses the layout parameters, and
+                       ``include-passage-references`` to find the passage reference line.
+        :return: the passage as the API would have returned it with those parameters
+        """
+        indent_char: str = '\t' if params['indent-using'] == 'tab' else ' '
+        # The API draws a line of "=" above each passage and a line of "_" above each heading
+        passage_rule: str = '=' * params['horizontal-line-length']
+        heading_rule: str = '_' * params['horizontal-line-length']
+        first_line: bool = True
+        awaiting_reference: bool = params['include-passage-references']
+        in_footnotes: bool = False
+        lines: List[str] = []
+
+        for line in passage.split('\n'):
+            text: str = line.lstrip('\t')
+            tabs: int = len(line) - len(text)
+            if not text.strip():
+                lines.append(line if in_footnotes else '')
+                continue
+            if in_footnotes or (tabs == 0 and text.startswith('Footnotes')):
+                # Footnotes are left as they are, apart from wrapping
+                in_footnotes = True
+                lines.extend(TextFormatter.__wrap(text, '', '', params['line-length']))
+                continue
+
+            if not params['include-verse-numbers']:
+                text = sub(r'\[\d+\] ?', '', text)
+
+            if first_line and params['include-passage-horizontal-lines']:
+                lines.append(passage_rule)
+            first_line = False
+
+            if tabs == 0:
+                if not awaiting_reference and params['include-heading-horizontal-lines']:
+                    lines.append(heading_rule)
+                first: str = ''
+                subsequent: str = ''
+            elif tabs == TextFormatter.__PARAGRAPH_TABS:
+                first = indent_char * params['indent-paragraphs']
+                subsequent = ''
+            elif tabs == TextFormatter.__DOXOLOGY_TABS:
+                first = subsequent = indent_char * params['indent-psalm-doxology']
+            elif tabs == TextFormatter.__DECLARES_TABS:
+                first = subsequent = indent_char * params['indent-declares']
+            elif params['indent-poetry']:
+                first = subsequent = indent_char * (params['indent-poetry-lines'] * (tabs // 2))
+            else:
+                first = subsequent = ''
+            awaiting_reference = False
+            lines.extend(TextFormatter.__wrap(text, first, subsequent, params['line-length']))
+
+        return '\n'.join(lines)
+
+    @staticmethod
+    def __wrap(text: str, first: str, subsequent: str, line_length: int) -> List[str]:
+        """
+        Wraps a line of text
+        :param text: the line, without indentation
+        :param first: indentation of the first line
+        :param subsequent: indentation of the wrapped lines
+        :param line_length: maximum line length (0 for unlimited)
+        :return: the wrapped lines
+        """
+        if not line_length:
+            return [first + text]
+        return wrap(text, line_length, initial_indent=first, subsequent_indent=subsequent,
+                    break_long_words=False, break_on_hyphens=False) or [first]
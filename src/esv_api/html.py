@@ -1,20 +1,29 @@
+from src.esv_api.breaker import CircuitBreaker
+from src.esv_api.cache import PassageCache
+from src.esv_api.key_pool import KeyPool
 from src.esv_api.method import Method
 from src.esv_api.passage import PassageInvalid, PassageNotFound
-from typing import List
-import requests
+from typing import List, Optional, Union
 
 
 class HTML(Method):
     """
     Gets an HTML version of a passage from the ESV API
     """
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: Union[str, KeyPool], cache: Optional[PassageCache] = None,
+                 breaker: Optional[CircuitBreaker] = None, lazy_responses: bool = False) -> None:
         """
-        :param api_key: ESV API key
+        :param api_key: ESV API key, or a pool of keys to spread requests across
+        :param cache: cache to keep responses in, compressed (optional)
+        :param breaker: circuit breaker for the API. While it is open, cached responses are served regardless of their
+                        age and marked as degraded (optional)
+        :param lazy_responses: Return ``LazyResponse`` objects, which only decode the fields that are read, instead of
+                               dicts
         """
-        super().__init__()
-        self.__API_KEY: str = api_key
+        super().__init__(cache, breaker)
+        self.__API_KEY: Union[str, KeyPool] = api_key
         self.__API_URL: str = 'https://api.esv.org/v3/passage/html/'
+        self.__lazy_responses: bool = lazy_responses
 
     def get_passage(self, query: str,
                     include_passage_references: bool = True,
@@ -91,9 +100,12 @@ class HTML(Method):
                                                 'next_verse': int,
                                                 'prev_chapter': List[int],
                                                 'next_chapter': List[int]]]
-                      'passages': List[str] (the HTML)]
+                      'passages': List[str] (the HTML),
+                      'degraded': bool (only present, and True, if served from the cache while the API is unavailable)]
         :raises PassageInvalid: for invalid passage queries (though the API is very lenient).
-        :raises PassageNotFound: for connection issues.
+        :raises PassageNotFound: for connection issues, or a body that is not JSON. With ``lazy_responses``, only the
+                                 fields before ``passages`` and the end of the body are checked: a field that is
+                                 malformed raises ``ValueError`` when it is read, not ``PassageNotFound``.
         """
         params = {
             'q': query,
@@ -125,16 +137,13 @@ class HTML(Method):
                 attach_audio_link_to if attach_audio_link_to == 'passage' or attach_audio_link_to == 'heading'
                 else 'passage'
         }
-        headers: dict = {'Authorization': 'Token %s' % self.__API_KEY}
-
-        try:
-            response = requests.get(self.__API_URL, params=params, headers=headers).json()
-            if 'passages' in response and len(response['passages']):
-                return response
-            else:
-                raise PassageInvalid(query)
-        except requests.HTTPError:
-            raise PassageNotFound(query)
+        response, degraded = self._get_json(self.__API_URL, params, self.__API_KEY, PassageNotFound(query),
+                                            lazy=self.__lazy_responses, required='passages')
+        if response is None:
+            raise PassageInvalid(query)
+        if degraded:
+            response['degraded'] = True
+        return response
 
     def get_passage_basic(self, query) -> List[str]:
         """
@@ -0,0 +1,113 @@
+from bisect import bisect_left
+from threading import Lock
+from time import monotonic
+from typing import List, Optional, Tuple
+
+
+class KeyPool(object):
+    """
+    A pool of ESV API keys. Each request uses the key with the most remaining budget, and keys the API rejects or
+    throttles are set aside for a while.
+    """
+    # The ESV API allows 60 requests per minute, 1,000 per hour, and 5,000 per day for each key.
+    DEFAULT_QUOTAS: Tuple[Tuple[int, float], ...] = ((60, 60.0), (1000, 3600.0), (5000, 86400.0))
+    # Status codes for which a key is set aside: authorization errors and throttling
+    REJECTED: Tuple[int, ...] = (401, 403, 429)
+
+    def __init__(self, keys: List[str],
+                 quotas: Tuple[Tuple[int, float], ...] = DEFAULT_QUOTAS,
+                 cooldown: float = 60.0) -> None:
+        """
+        :param keys: ESV API keys
+        :param quotas: (requests, seconds) limits that apply to each key
+        :param cooldown: seconds to set a key aside for after an authorization error, or after throttling without a
+                         ``Retry-After`` header
+        """
+        if not keys:
+            raise ValueError("A key pool needs at least one key")
+        self.__keys: List[str] = list(dict.fromkeys(keys))
+        self.__quotas: Tuple[Tuple[int, float], ...] = quotas
+        self.__period: float = max((period for _, period in quotas), default=0.0)
+        self.__cooldown: float = cooldown
+        self.__usage: dict = {key: [] for key in self.__keys}
+        self.__disabled_until: dict = {key: 0.0 for key in self.__keys}
+        self.__requests: dict = {key: 0 for key in self.__keys}
+        self.__rejections: dict = {key: 0 for key in self.__keys}
+        self.__lock: Lock = Lock()
+
+    def acquire(self) -> str:
+        """
+        Picks the key to use for a request and counts the request against it. Keys that are set aside are only used
+        if every key is, in which case the one that comes back soonest is used.
+        :return: an API key
+        """
+        with self.__lock:
+            now: float = monotonic()
+            available: List[str] = [key for key in self.__keys if self.__disabled_until[key] <= now]
+            if available:
+                key: str = max(available, key=lambda k: self.__remaining(k, now))
+            else:
+                key = min(self.__keys, key=lambda k: self.__disabled_until[k])
+            self.__usage[key].append(now)
+            self.__requests[key] += 1
+            return key
+
+    def record(self, key: str, status_code: int, retry_after: Optional[str] = None) -> None:
+        """
+        Records the API's response to a request made with a key
+        :param key: the key from ``acquire``
+        :param status_code: HTTP status code of the response
+        :param retry_after: ``Retry-After`` header of the response, if any
+        """
+        if status_code not in self.REJECTED:
+            return
+        cooldown: float = self.__cooldown
+        if status_code == 429 and retry_after and retry_after.strip().isdigit():
+            cooldown = float(retry_after)
+        with self.__lock:
+            if key in self.__disabled_until:
+                self.__disabled_until[key] = monotonic() + cooldown
+                self.__rejections[key] += 1
+
+    @property
+    def available(self) -> int:
+        """
+        :return: the number of keys that are not set aside
+        """
+        with self.__lock:
+            now: float = monotonic()
+            return sum(1 for key in self.__keys if self.__disabled_until[key] <= now)
+
+    @property
+    def stats(self) -> List[dict]:
+        """
+        :return: List[Dict['key': str (the last 4 characters of the key),
+                           'requests': int,
+                           'rejections': int (authorization errors and throttling),
+                           'remaining': int (requests left in the tightest quota),
+                           'available': bool,
+                           'disabled_for': float (seconds until the key is used again)]]
+        """
+        with self.__lock:
+            now: float = monotonic()
+            return [{'key': key[-4:],
+                     'requests': self.__requests[key],
+                     'rejections': self.__rejections[key],
+                     'remaining': max(self.__remaining(key, now), 0),
+                     'available': self.__disabled_until[key] <= now,
+                     'disabled_for': max(self.__disabled_until[key] - now, 0.0)} for key in self.__keys]
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def __remaining(self, key: str, now: float) -> int:
+        """
+        Gets how many requests a key has left before hitting a quota. The lock must be held.
+        :param key: the key to check
+        :param now: the current monotonic time
+        :return: the requests left in the tightest quota
+        """
+        usage: List[float] = self.__usage[key]
+        del usage[:bisect_left(usage, now - self.__period)]
+        return min((limit - (len(usage) - bisect_left(usage, now - period)) for limit, period in self.__quotas),
+                   default=0)
@@ -22,3 +22,10 @@ class PassageInvalid(Exception):
 
     def __str__(self) -> str:
         return "Passage Invalid {}".format(self.__verse)
+
+
+class DegradedPassage(tuple):
+    """
+    A passage served from the cache while the API is unavailable. Otherwise the same as the tuple it wraps.
+    """
+    degraded: bool = True
@@ -0,0 +1,164 @@
+from collections.abc import MutableMapping
+from json import JSONDecoder
+from re import compile as recompile
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+
+class LazyResponse(MutableMapping):
+    """
+    An API response backed by the raw response body. It acts like the dict ``.json()`` would have returned, but
+    top-level fields are only decoded up to the one being read: reading ``canonical`` never decodes ``passages``.
+    ``has_items`` checks a field without decoding it. Iterating over the response or changing it decodes every field.
+    Unlike a dict, it is not a ``dict`` subclass and ``json.dumps`` can not encode it: use ``to_dict`` (or ``raw``).
+    """
+    __slots__ = ('__raw', '__text', '__position', '__values', '__complete')
+
+    __DECODER: JSONDecoder = JSONDecoder()
+    __OPEN = recompile(r'\s*{\s*')
+    __SEPARATOR = recompile(r'\s*([,}])\s*')
+    __COLON = recompile(r'\s*:\s*')
+    # Values that are falsy once decoded
+    __EMPTY = recompile(r'(?:\[\s*]|{\s*}|""|null|false|-?0(?:\.0*)?(?:[eE][-+]?\d+)?)\s*[,}]')
+
+    def __init__(self, raw: bytes) -> None:
+        """
+        :param raw: the response body, a JSON object
+        """
+        self.__raw: bytes = raw
+        self.__text: Optional[str] = None
+        self.__position: int = 0
+        self.__values: Dict[str, Any] = {}
+        self.__complete: bool = False
+
+    @property
+    def raw(self) -> bytes:
+        return self.__raw
+
+    def __getitem__(self, key: str) -> Any:
+        while key not in self.__values:
+            if self.__next() is None:
+                raise KeyError(key)
+        return self.__values[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.__decode_all()
+        self.__values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        self.__decode_all()
+        del self.__values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__decode_all())
+
+    def __len__(self) -> int:
+        return len(self.__decode_all())
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        return "LazyResponse({})".format(self.__decode_all())
+
+    def has_items(self, key: str) -> bool:
+        """
+        Finds out if a field is present and not empty (e.g. a non-empty list) without decoding it. Only the fields
+        before it are decoded.
+        :param key: the field
+        :return: True if the field is present and would be truthy once decoded
+        :raises ValueError: if the body is not a JSON object.
+        """
+        while key not in self.__values:
+            if self.__complete:
+                return False
+            found, position = self.__key_at(self.__position)
+            if found is None:
+                self.__complete = True
+                return False
+            if found == key:
+                return self.__EMPTY.match(self.__text, position) is None
+            self.__next()
+        return bool(self.__values[key])
+
+    def copy(self) -> dict:
+        """
+        :return: a shallow copy of the response, as a dict
+        """
+        return self.to_dict()
+
+    def __or__(self, other: Mapping) -> dict:
+        return {**self.__decode_all(), **other}
+
+    def __ror__(self, other: Mapping) -> dict:
+        return {**other, **self.__decode_all()}
+
+    def __ior__(self, other: Mapping) -> 'LazyResponse':
+        self.update(other)
+        return self
+
+    def __reversed__(self) -> Iterator[str]:
+        return reversed(list(self.__decode_all()))
+
+    def to_dict(self) -> dict:
+        """
+        :return: the fully decoded response
+        """
+        return dict(self.__decode_all())
+
+    def __decode_all(self) -> Dict[str, Any]:
+        """
+        :return: every field of the response, decoded
+        :raises ValueError: if the body is not a JSON object.
+        """
+        while self.__next() is not None:
+            pass
+        return self.__values
+
+    def __next(self) -> Optional[str]:
+        """
+        Decodes the next top-level field of the response
+        :return: the field's key, or None if every field has been decoded
+        :raises ValueError: if the body is not a JSON object.
+        """
+        if self.__complete:
+            return None
+        key, position = self.__key_at(self.__position)
+        if key is None:
+            self.__complete = True
+            return None
+        value, self.__position = self.__DECODER.raw_decode(self.__text, position)
+        self.__values[key] = value
+        return key
+
+    def __key_at(self, position: int) -> Tuple[Optional[str], int]:
+        """
+        Reads the key of the next top-level field, without decoding its value
+        :param position: where the previous field's value ends (0 before the first field)
+        :return: the field's key (None if there are no more fields) and where its value starts
+        :raises ValueError: if the body is not a JSON object.
+        """
+        if self.__text is None:
+            self.__text = self.__raw.decode("utf-8")
+        if position == 0:
+            match = self.__OPEN.match(self.__text)
+            # A truncated body is caught here, without decoding it
+            if match is None or not self.__text.rstrip().endswith("}"):
+                raise ValueError("Response is not a JSON object: {!r}".format(self.__raw[:64]))
+            if self.__text.startswith("}", match.end()):
+                return None, match.end()
+        else:
+            match = self.__SEPARATOR.match(self.__text, position)
+            if match is None:
+                raise ValueError("Malformed response at {}".format(position))
+            if match.group(1) == "}":
+                return None, position
+
+        key, position = self.__DECODER.raw_decode(self.__text, match.end())
+        match = self.__COLON.match(self.__text, position)
+        if not isinstance(key, str) or match is None:
+            raise ValueError("Malformed response at {}".format(position))
+        return key, match.end()
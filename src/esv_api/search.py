@@ -1,5 +1,9 @@
+from math import ceil
+from src.esv_api.breaker import CircuitBreaker
+from src.esv_api.cache import PassageCache
+from src.esv_api.key_pool import KeyPool
 from src.esv_api.method import Method
-import requests
+from typing import Optional, Tuple, Union
 
 
 class SearchError(Exception):
@@ -14,21 +18,30 @@ class SearchInvalid(Exception):
     """
     Exception for invalid search
     """
-    def __init__(self, size: str):
-        super().__init__("{} > 100, the max page size".format(size))
+    def __init__(self, size: str, reason: str = "> 100, the max page size"):
+        super().__init__("{} {}".format(size, reason))
 
 
 class Search(Method):
     """
     Search the ESV (via the API) for passages.
     """
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: Union[str, KeyPool], cache: Optional[PassageCache] = None,
+                 breaker: Optional[CircuitBreaker] = None, lazy_responses: bool = False) -> None:
         """
-        :param api_key: ESV API key
+        :param api_key: ESV API key, or a pool of keys to spread requests across
+        :param cache: cache to keep responses in, compressed (optional). Results are then fetched and cached in pages of
+                      the maximum size, and every page size is served from those.
+        :param breaker: circuit breaker for the API. While it is open, cached responses are served regardless of their
+                        age and marked as degraded (optional)
+        :param lazy_responses: Return ``LazyResponse`` objects, which only decode the fields that are read, instead of
+                               dicts. Pages served from the cache are always dicts.
         """
-        super().__init__()
-        self.__API_KEY: str = api_key
+        super().__init__(cache, breaker)
+        self.__API_KEY: Union[str, KeyPool] = api_key
         self.__API_URL: str = 'https://api.esv.org/v3/passage/search/'
+        self.__MAX_PAGE_SIZE: int = 100
+        self.__lazy_responses: bool = lazy_responses
 
     def search(self, query: str, page_size: int = 20, page: int = 1) -> dict:
         """
@@ -40,21 +53,76 @@ class Search(Method):
                       'total_results': int,
                       'results': List[Dict['reference': str,
                                            'content': str]]
-                      'total_pages': int]
-        :raises SearchInvalid: raised for invalid queries
+                      'total_pages': int,
+                      'degraded': bool (only present, and True, if served from the cache while the API is unavailable)]
+        :raises SearchInvalid: raised for invalid queries, page sizes, and pages
         :raises SearchError: raised for connection errors
         """
-        try:
-            if page_size > 100:
-                raise SearchInvalid(str(page_size))
-            headers: dict = {'Authorization': 'Token %s' % self.__API_KEY}
-            params = {
-                'q': query,
-                'page-size': page_size,
-                'page': page
-            }
-
-            response: dict = requests.get(self.__API_URL, params=params, headers=headers).json()
-            return response
-        except requests.HTTPError:
-            raise SearchError("There was a connection issue")
+        if page_size > self.__MAX_PAGE_SIZE:
+            raise SearchInvalid(str(page_size))
+        if page_size < 1:
+            raise SearchInvalid("Page size {}".format(page_size), "< 1")
+        if page < 1:
+            raise SearchInvalid("Page {}".format(page), "< 1")
+        if self.cache is not None:
+            return self.__search_pages(query, page_size, page)
+        params = {
+            'q': query,
+            'page-size': page_size,
+            'page': page
+        }
+
+        response, degraded = self._get_json(self.__API_URL, params, self.__API_KEY,
+                                            SearchError("There was a connection issue"), lazy=self.__lazy_responses)
+        if degraded:
+            response['degraded'] = True
+        return response
+
+    def __search_pages(self, query: str, page_size: int, page: int) -> dict:
+        """
+        Serves a page of search results from the cached pages of the maximum size, fetching only the ones missing. The
+        first of those pages gives the total number of results, so no page past the last one is ever requested.
+        :param query: Query for the API
+        :param page_size: The number of results per page (max 100)
+        :param page: which page of the results to return
+        :return: the page, in the same format as ``search``
+        :raises SearchError: if the API answers with an error (e.g. an invalid key or too many requests)
+        """
+        first: int = (page - 1) * page_size
+        last: int = first + page_size
+
+        response, degraded = self.__search_page(query, 1)
+        total_results: int = response['total_results']
+        last_upstream_page: int = ceil(min(last, total_results) / self.__MAX_PAGE_SIZE)
+        results: list = []
+        for upstream_page in range(first // self.__MAX_PAGE_SIZE + 1, last_upstream_page + 1):
+            if upstream_page > 1:
+                response, page_degraded = self.__search_page(query, upstream_page)
+                degraded = degraded or page_degraded
+            offset: int = (upstream_page - 1) * self.__MAX_PAGE_SIZE
+            results.extend(response['results'][max(first - offset, 0):last - offset])
+
+        result: dict = {'page': page,
+                        'total_results': total_results,
+                        'results': results,
+                        'total_pages': ceil(total_results / page_size)}
+        if degraded:
+            result['degraded'] = True
+        return result
+
+    def __search_page(self, query: str, upstream_page: int) -> Tuple[dict, bool]:
+        """
+        Gets a page of search results of the maximum size, through the cache
+        :param query: Query for the API
+        :param upstream_page: which page of the maximum size to get
+        :return: the API response and whether it is degraded
+        :raises SearchError: if the API answers with an error (e.g. an invalid key or too many requests)
+        """
+        params: dict = {'q': query, 'page-size': self.__MAX_PAGE_SIZE, 'page': upstream_page}
+        response, degraded = self._get_json(self.__API_URL, params, self.__API_KEY,
+                                            SearchError("There was a connection issue"))
+        if not isinstance(response, dict) or 'results' not in response or 'total_results' not in response:
+            detail = response.get('detail') if isinstance(response, dict) else None
+            raise SearchError(detail if detail else "Unexpected response for page {} of {}".format(upstream_page,
+                                                                                                   query))
+        return response, degraded
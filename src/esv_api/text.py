@@ -1,8 +1,10 @@
-import requests
-from src.esv_api.passage import PassageInvalid, PassageNotFound
-from typing import List
+from src.esv_api.breaker import CircuitBreaker
+from src.esv_api.cache import PassageCache
+from src.esv_api.formatter import TextFormatter
+from src.esv_api.key_pool import KeyPool
+from src.esv_api.passage import DegradedPassage, PassageInvalid, PassageNotFound
+from typing import List, Optional, Union
 from src.esv_api.method import Method
-from requests import get
 from re import split as resplit
 from re import sub, search
 
@@ -11,13 +13,21 @@ class Text(Method):
     """
     Gets a text-only version of a passage from the ESV API
     """
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: Union[str, KeyPool], cache: Optional[PassageCache] = None,
+                 breaker: Optional[CircuitBreaker] = None, local_formatting: bool = False) -> None:
         """
-        :param api_key: Your ESV API key
+        :param api_key: Your ESV API key, or a pool of keys to spread requests across
+        :param cache: cache to keep responses in, compressed (optional)
+        :param breaker: circuit breaker for the API. While it is open, cached responses are served regardless of their
+                        age and marked as degraded (optional)
+        :param local_formatting: Lay passages out locally instead of having the API do it. Passages that only differ in
+                                 layout (line length, indentation, verse numbers, horizontal lines) are then one
+                                 request and one cache entry. Experimental, see the README.
         """
-        super().__init__()
-        self.__API_KEY: str = api_key
+        super().__init__(cache, breaker)
+        self.__API_KEY: Union[str, KeyPool] = api_key
         self.__API_URL: str = 'https://api.esv.org/v3/passage/text/'
+        self.__local_formatting: bool = local_formatting
 
     def get_chapter_json(self, book: str, chapter: int) -> dict:
         """
@@ -29,6 +39,7 @@ class Text(Method):
                  'chapter': str
                  'verses': Dict[heading (none for no heading): ["1 ...", "2 ..."], heading: verses...]
                  'footnotes': str
+                 'degraded': bool (only present, and True, if served from the cache while the API is unavailable)
         :raises PassageInvalid: for invalid passage queries.
         :raises PassageNotFound: for connection issues.
         """
@@ -68,7 +79,7 @@ class Text(Method):
         :param include_short_copyright: Include the string "ESV" at the end of the text, if include-copyright is not set
         :param include_copyright: Longer copyright notice at the end of the text, if include_short_copyright is not set.
         :param include_passage_horizontal_lines: Includes a horizontal_line_length of equal signs above each passage.
-        :param include_heading_horizontal_lines: Includes a horizontal_line_length of equal signs above each passage.
+        :param include_heading_horizontal_lines: Includes a horizontal_line_length of underscores above each heading.
         :param horizontal_line_length: Length of the horizontal line(s)
         :param include_selahs: Include the word "Selah" in certain Psalms.
         :param indent_using: Whether to indent using "tab" or "space" (only).
@@ -81,6 +92,7 @@ class Text(Method):
         :return: Tuple[passage_reference: str,
                         Dict[heading: List[verses (str)]]
                         footnotes: str]
+                 (a ``DegradedPassage`` if served from the cache while the API is unavailable)
         :raises PassageInvalid: for invalid passage queries.
         :raises PassageNotFound: for connection issues.
         """
@@ -106,12 +118,17 @@ class Text(Method):
             'line-length': line_length if line_length >= 0 else 0
         }
 
-        headers: dict = {'Authorization': 'Token %s' % self.__API_KEY}
+        request_params: dict = params
+        if self.__local_formatting:
+            # Every layout shares the one canonical request, which is laid out below
+            request_params = {key: value for key, value in params.items() if key not in TextFormatter.LAYOUT_PARAMS}
+            request_params.update(TextFormatter.CANONICAL_PARAMS)
 
-        try:
-            response: dict = get(self.__API_URL, params=params, headers=headers).json()
-        except requests.HTTPError:
-            raise PassageNotFound("Connection error when getting {}".format(query))
+        response, degraded = self._get_json(self.__API_URL, request_params, self.__API_KEY,
+                                            PassageNotFound("Connection error when getting {}".format(query)))
+
+        if self.__local_formatting and 'passages' in response:
+            response['passages'] = [TextFormatter.render(passage, params) for passage in response['passages']]
 
         try:
             loc_footnotes: int = str(response['passages']).find('Footnotes')
@@ -125,7 +142,7 @@ class Text(Method):
             raise PassageInvalid(query)
 
         if passage:
-            return passage
+            return DegradedPassage(passage) if degraded else passage
         else:
             raise PassageNotFound
 
@@ -138,49 +155,34 @@ class Text(Method):
         """
         # Check for 1 chapter books which the API returns (by name with 1) as only the first verse.
         single_chapter_check: str = chapter_in[0:chapter_in.rfind(' ')]
+        single_chapter_books: dict = {"Obadiah": 21, "Philemon": 25, "2 John": 13, "3 John": 15, "Jude": 25}
 
-        if single_chapter_check in ["Obadiah", "Philemon", "2 John", "3 John", "Jude"]:
-            if single_chapter_check == "Obadiah":
-                chapter_pre = self.get_passage("Obadiah 1-21")
-                return {"book": "Obadiah",
-                        "chapter": "1",
-                        "verses": {heading: self.__split_verses(chapter_pre[1][heading]) for heading in
-                                   chapter_pre[1].keys()},
-                        "footnotes": chapter_pre[2]}
-            elif single_chapter_check == "Philemon":
-                chapter_pre = self.get_passage("Philemon 1-25")
-                return {"book": "Philemon",
-                        "chapter": "1",
-                        "verses": {heading: self.__split_verses(chapter_pre[1][heading]) for heading in
-                                   chapter_pre[1].keys()},
-                        "footnotes": chapter_pre[2]}
-            elif single_chapter_check == "2 John":
-                chapter_pre = self.get_passage("2 John 1-13")
-                return {"book": "2 John",
-                        "chapter": "1",
-                        "verses": {heading: self.__split_verses(chapter_pre[1][heading]) for heading in
-                                   chapter_pre[1].keys()},
-                        "footnotes": chapter_pre[2]}
-            elif single_chapter_check == "3 John":
-                chapter_pre = self.get_passage("3 John 1-15")
-                return {"book": "3 John",
-                        "chapter": "1",
-                        "verses": {heading: self.__split_verses(chapter_pre[1][heading]) for heading in
-                                   chapter_pre[1].keys()},
-                        "footnotes": chapter_pre[2]}
-            elif single_chapter_check == "Jude":
-                chapter_pre = self.get_passage("Jude 1-25")
-                return {"book": "Jude",
-                        "chapter": "1",
-                        "verses": {heading: self.__split_verses(chapter_pre[1][heading]) for heading in
-                                   chapter_pre[1].keys()},
-                        "footnotes": chapter_pre[2]}
+        if single_chapter_check in single_chapter_books:
+            chapter_pre = self.get_passage("{} 1-{}".format(single_chapter_check,
+                                                           single_chapter_books[single_chapter_check]))
+            return self.__chapter_dict(single_chapter_check, "1", chapter_pre)
 
         chapter_pre = self.get_passage(chapter_in)
-        return {"book": chapter_pre[0][0:chapter_pre[0].rfind(' ')],
-                "chapter": chapter_pre[0][chapter_pre[0].rfind(' ') + 1:],
-                "verses": {heading: self.__split_verses(chapter_pre[1][heading]) for heading in chapter_pre[1].keys()},
-                "footnotes": chapter_pre[2]}
+        return self.__chapter_dict(chapter_pre[0][0:chapter_pre[0].rfind(' ')],
+                                   chapter_pre[0][chapter_pre[0].rfind(' ') + 1:], chapter_pre)
+
+    def __chapter_dict(self, book: str, chapter: str, chapter_pre: tuple) -> dict:
+        """
+        Makes the dictionary of a chapter from the output of ``get_passage``
+        :param book: Name of the book
+        :param chapter: The chapter number
+        :param chapter_pre: ``get_passage`` output for the chapter
+        :return: Dictionary of the chapter, with 'degraded': True if it was served from the cache while the API is
+                 unavailable
+        """
+        chapter_dict: dict = {"book": book,
+                              "chapter": chapter,
+                              "verses": {heading: self.__split_verses(chapter_pre[1][heading]) for heading in
+                                         chapter_pre[1].keys()},
+                              "footnotes": chapter_pre[2]}
+        if isinstance(chapter_pre, DegradedPassage):
+            chapter_dict["degraded"] = True
+        return chapter_dict
 
     @staticmethod
     def __parse_headings(passage: str) -> dict:
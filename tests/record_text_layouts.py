@@ -0,0 +1,78 @@
+########################################################################
+# Records the fixtures test_formatter compares TextFormatter against.
+#
+# Usage (from the root of the repository, with a key in api-key.txt):
+#   python -m tests.record_text_layouts
+#
+# Every case is fetched twice straight from the text API: once in the
+# API's own layout and once with TextFormatter.CANONICAL_PARAMS.
+########################################################################
+from json import dump
+from os import makedirs, path
+from src.esv_api.formatter import TextFormatter
+import requests
+
+API_URL: str = 'https://api.esv.org/v3/passage/text/'
+FIXTURES: str = path.join(path.dirname(__file__), "fixtures", "text_layouts.json")
+
+BASE_PARAMS: dict = {'include-passage-references': True, 'include-footnotes': True, 'include-footnote-body': True,
+                     'include-headings': True, 'include-selahs': True, 'include-verse-numbers': True,
+                     'include-short-copyright': False, 'include-copyright': False,
+                     'include-passage-horizontal-lines': False, 'include-heading-horizontal-lines': False,
+                     'horizontal-line-length': 55, 'indent-using': 'space', 'indent-paragraphs': 2,
+                     'indent-poetry': True, 'indent-poetry-lines': 4, 'indent-declares': 40,
+                     'indent-psalm-doxology': 30, 'line-length': 0}
+
+# (query, what it covers, layout params that differ from BASE_PARAMS)
+CASES: list = [
+    ("Psalm 117", "short psalm with horizontal lines",
+     {'include-passage-horizontal-lines': True, 'include-heading-horizontal-lines': True,
+      'horizontal-line-length': 30, 'include-verse-numbers': False, 'indent-paragraphs': 3,
+      'indent-poetry-lines': 2, 'line-length': 40}),
+    ("Psalm 117", "short psalm, tabs", {'indent-using': 'tab'}),
+    ("Jeremiah 23:23-24", "declares the LORD", {'indent-declares': 20, 'line-length': 60}),
+    ("Psalm 41", "psalm doxology", {'indent-psalm-doxology': 10, 'indent-poetry': False}),
+    ("Psalm 72:18-20", "psalm doxology, tabs", {'indent-using': 'tab', 'indent-psalm-doxology': 4}),
+    ("John 1", "wrapped prose chapter", {'line-length': 50, 'indent-paragraphs': 4}),
+    ("John 1", "prose chapter, no verse numbers", {'include-verse-numbers': False, 'line-length': 72}),
+    ("Genesis 1-2", "multi-chapter query", {'line-length': 60, 'include-passage-horizontal-lines': True}),
+]
+
+
+def fetch(params: dict, api_key: str) -> list:
+    """
+    :param params: parameters for the text API
+    :param api_key: ESV API key
+    :return: the passages the API answers with
+    :raises requests.HTTPError: if the API answers with an error
+    """
+    response = requests.get(API_URL, params=params, headers={'Authorization': 'Token %s' % api_key}, timeout=30)
+    response.raise_for_status()
+    return response.json()['passages']
+
+
+def record(api_key: str) -> list:
+    """
+    :param api_key: ESV API key
+    :return: the fixtures, one per case
+    """
+    fixtures: list = []
+    for query, description, layout in CASES:
+        params: dict = dict(BASE_PARAMS, q=query, **layout)
+        canonical: dict = {key: value for key, value in params.items() if key not in TextFormatter.LAYOUT_PARAMS}
+        canonical.update(TextFormatter.CANONICAL_PARAMS)
+        fixtures.append({'query': query,
+                         'description': description,
+                         'params': params,
+                         'canonical': fetch(canonical, api_key),
+                         'expected': fetch(params, api_key)})
+    return fixtures
+
+
+if __name__ == '__main__':
+    with open("api-key.txt", "r") as key_in:
+        key = key_in.read().strip()
+    makedirs(path.dirname(FIXTURES), exist_ok=True)
+    with open(FIXTURES, "w") as fixtures_out:
+        dump(record(key), fixtures_out, indent=2)
+        fixtures_out.write("\n")
@@ -0,0 +1,47 @@
+from time import sleep
+from unittest import TestCase
+from src.esv_api.breaker import CircuitBreaker
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self) -> None:
+        self.breaker = CircuitBreaker(window=4, min_calls=4, open_duration=0.02, slow_call_duration=1.0)
+        self.endpoint = "https://api.esv.org/v3/passage/text/"
+
+    def test_failures_open(self):
+        for success in [True, False, True, False]:
+            self.assertTrue(self.breaker.allow(self.endpoint))
+            self.breaker.record(self.endpoint, success, 0.1)
+        self.assertEqual(CircuitBreaker.OPEN, self.breaker.state(self.endpoint))
+        self.assertFalse(self.breaker.allow(self.endpoint))
+        # Other endpoints have their own circuit
+        self.assertTrue(self.breaker.allow("https://api.esv.org/v3/passage/html/"))
+
+    def test_slow_calls_open(self):
+        for _ in range(4):
+            self.breaker.allow(self.endpoint)
+            self.breaker.record(self.endpoint, True, 2.0)
+        self.assertEqual(CircuitBreaker.OPEN, self.breaker.state(self.endpoint))
+
+    def test_half_open(self):
+        for _ in range(4):
+            self.breaker.allow(self.endpoint)
+            self.breaker.record(self.endpoint, False, 0.1)
+        sleep(0.03)
+        self.assertEqual(CircuitBreaker.HALF_OPEN, self.breaker.state(self.endpoint))
+        self.assertTrue(self.breaker.allow(self.endpoint))
+        # Only one probe at a time
+        self.assertFalse(self.breaker.allow(self.endpoint))
+        self.breaker.record(self.endpoint, False, 0.1)
+        self.assertEqual(CircuitBreaker.OPEN, self.breaker.state(self.endpoint))
+
+        sleep(0.03)
+        self.assertTrue(self.breaker.allow(self.endpoint))
+        self.breaker.record(self.endpoint, True, 0.1)
+        self.assertEqual(CircuitBreaker.CLOSED, self.breaker.state(self.endpoint))
+
+    def test_timeout(self):
+        self.assertEqual(10.0, CircuitBreaker().timeout)
+        self.assertEqual(4.0, CircuitBreaker(slow_call_duration=2).timeout)
+        self.assertEqual(3.0, CircuitBreaker(timeout=3).timeout)
+        self.assertIsNone(CircuitBreaker(timeout=0).timeout)
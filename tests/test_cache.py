@@ -0,0 +1,82 @@
+from threading import Event
+from time import sleep
+from unittest import TestCase
+from src.esv_api.cache import PassageCache, train_dictionary
+
+
+class TestCache(TestCase):
+    def setUp(self) -> None:
+        self.samples = [('{"query": "John 11:%d", "canonical": "John 11:%d", "passages": ["<h2 class=\\"extra_text\\">'
+                         'John 11:%d</h2>\\n<p id=\\"p43011%03d_01-1\\" class=\\"virtual\\"><b class=\\"verse-num\\" '
+                         'id=\\"v43011%03d-1\\">%d&nbsp;</b>Jesus wept.</p>"]}' % ((verse,) * 6)).encode()
+                        for verse in range(1, 40)]
+
+    def test_put_get(self):
+        cache = PassageCache()
+        key = PassageCache.make_key("https://api.esv.org/v3/passage/html/", {'q': "John 11:35"})
+        self.assertIsNone(cache.get(key))
+        cache.put(key, self.samples[34])
+        self.assertEqual(self.samples[34], cache.get(key))
+        self.assertIn(key, cache)
+
+        stats = cache.stats
+        self.assertEqual(1, stats['entries'])
+        self.assertEqual(len(self.samples[34]), stats['raw_bytes'])
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+
+    def test_dictionary(self):
+        dictionary = train_dictionary(self.samples[:30])
+        self.assertTrue(dictionary)
+        plain = PassageCache()
+        trained = PassageCache(dictionary)
+        for i, sample in enumerate(self.samples[30:]):
+            plain.put(str(i), sample)
+            trained.put(str(i), sample)
+            self.assertEqual(sample, trained.get(str(i)))
+        self.assertLess(trained.stats['compressed_bytes'], plain.stats['compressed_bytes'])
+
+    def test_max_entries(self):
+        cache = PassageCache(max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+        self.assertEqual(2, len(cache))
+        self.assertNotIn("b", cache)
+        self.assertEqual(2, cache.stats['raw_bytes'])
+
+    def test_ttl(self):
+        cache = PassageCache(soft_ttl=0.01, hard_ttl=0.05, jitter=0)
+        cache.put("a", b"1", etag='"abc"')
+        self.assertFalse(cache.lookup("a").is_stale)
+        sleep(0.02)
+        entry = cache.lookup("a")
+        self.assertTrue(entry.is_stale)
+        self.assertEqual({'If-None-Match': '"abc"'}, entry.validators)
+        sleep(0.04)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.peek("a"))
+        cache.refresh("a")
+        self.assertEqual(b"1", cache.get("a"))
+        self.assertEqual(1, cache.stats['stale_hits'])
+
+    def test_revalidate(self):
+        cache = PassageCache()
+        release = Event()
+        calls = []
+
+        def fetch():
+            release.wait(1)
+            calls.append(1)
+
+        self.assertTrue(cache.revalidate("a", fetch))
+        self.assertFalse(cache.revalidate("a", fetch))
+        release.set()
+        for _ in range(100):
+            if calls:
+                break
+            sleep(0.01)
+        sleep(0.01)
+        self.assertTrue(cache.revalidate("a", fetch))
+        self.assertEqual(2, cache.stats['revalidations'])
@@ -0,0 +1,141 @@
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from unittest import TestCase
+from unittest.mock import patch
+from src.esv_api.crossref import CrossrefBuilder, CrossrefGraph
+from src.esv_api.export import Exporter
+from src.esv_api.html import HTML
+from src.esv_api.passage import PassageNotFound
+
+
+class HTMLI(HTML):
+    """
+    HTML client that makes up chapters, each with a cross-reference from its first verse to Genesis 1:1, instead of
+    calling the API, and fails on request
+    """
+    def __init__(self, fail_at: str = None) -> None:
+        super().__init__("")
+        self.fail_at = fail_at
+        self.queries = []
+        self.options = {}
+
+    def get_passage(self, query: str, **options) -> dict:
+        self.queries.append(query)
+        self.options = options
+        if query == self.fail_at:
+            raise PassageNotFound(query)
+        book, chapter = (query, "1") if self.chapter_count(query) else query.rsplit(" ", 1)
+        verse = self.verse_id(book, int(chapter), 1)
+        return {'query': query, 'canonical': query,
+                'passages': ['<p><b class="verse-num" id="v{:08d}-1">1&nbsp;</b>Text<sup class="crossref">'
+                             '<a href="{}?q=Gen.+1%3A1">a</a></sup></p>'.format(verse, options['crossref_url'])]}
+
+
+class TestCrossref(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.file_name = path.join(self.directory.name, "crossrefs.bin")
+        self.builder = CrossrefBuilder()
+        self.john_1_1 = self.builder.verse_id("John", 1, 1)
+        self.genesis_1_1 = self.builder.verse_id("Genesis", 1, 1)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_parse_references(self):
+        self.assertEqual([1001001, 1001002, 1001003, 19033006, 19033009, 43001001],
+                         self.builder.parse_references("Gen. 1:1-3; Ps. 33:6, 9; John 1:1"))
+        self.assertEqual([46013004, 62001001], self.builder.parse_references("?q=1 Cor. 13:4; 1 John 1:1/"))
+        self.assertEqual([19023001], self.builder.parse_references("Psalms 22; 23:1"))
+        self.assertEqual([], self.builder.parse_references("Hezekiah 1:1"))
+
+    def test_parse_references_abbreviations(self):
+        self.assertEqual([11008027, 12002011], self.builder.parse_references("1 Kgs. 8:27; 2 Kgs. 2:11"))
+        self.assertEqual([19119105, 20003005, 21012001, 22002004, 50004004, 57001006],
+                         self.builder.parse_references("Pss. 119:105; Prov. 3:5; Eccles. 12:1; Song 2:4; Phil. 4:4; "
+                                                       "Philem. 6"))
+
+    def test_parse_references_single_chapter(self):
+        self.assertEqual([65001003], self.builder.parse_references("Jude 3"))
+        self.assertEqual([31001015, 31001016, 31001021], self.builder.parse_references("Obad. 15-16, 21"))
+        self.assertEqual([64001004], self.builder.parse_references("3 John 1:4"))
+
+    def test_parse_references_across_chapters(self):
+        john = [self.builder.verse_id("John", 1, verse) for verse in range(1, 52)]
+        john += [self.builder.verse_id("John", 2, verse) for verse in range(1, 4)]
+        self.assertEqual(john + [43002005], self.builder.parse_references("John 1:1-2:3, 5"))
+        self.assertEqual([19022031, 19023001, 19023002], self.builder.parse_references("Ps. 22:31-23:2"))
+
+    def test_add_html(self):
+        passage = ('<p><b class="chapter-num" id="v43001001-1">1:1&nbsp;</b>In the beginning was the Word'
+                   '<sup class="crossref"><a href="https://crossref.invalid/?q=Gen.+1%3A1%3B+1+John+1%3A1">a</a>'
+                   '</sup>, and the Word was with God, and the Word was God. <b class="verse-num" '
+                   'id="v43001002-1">2&nbsp;</b>He was in the beginning with God.'
+                   '<sup class="crossref"><a href="https://crossref.invalid/Gen.+1:1">b</a></sup>'
+                   '<a href="https://www.esv.org/John+1/">John 1</a></p>')
+        self.assertEqual(3, self.builder.add_html(passage))
+        self.assertEqual(3, len(self.builder))
+
+    def test_graph(self):
+        john_1_2 = self.builder.verse_id("John", 1, 2)
+        first_john_1_1 = self.builder.verse_id("1 John", 1, 1)
+        self.builder.add(self.john_1_1, self.genesis_1_1)
+        self.builder.add(self.john_1_1, first_john_1_1)
+        self.builder.add(john_1_2, self.genesis_1_1)
+        self.builder.add(self.genesis_1_1, john_1_2)
+        self.builder.write(self.file_name)
+
+        with CrossrefGraph(self.file_name) as graph:
+            self.assertEqual(4, len(graph))
+            self.assertEqual(4, graph.edge_count)
+            self.assertIn(self.john_1_1, graph)
+            self.assertEqual([self.genesis_1_1, first_john_1_1], graph.neighbours(self.john_1_1))
+            self.assertEqual([self.john_1_1, john_1_2], graph.reverse_neighbours(self.genesis_1_1))
+            self.assertEqual([], graph.neighbours(first_john_1_1))
+            self.assertEqual([], graph.neighbours(self.builder.verse_id("Jude", 1, 1)))
+            self.assertEqual({self.genesis_1_1, first_john_1_1}, graph.k_hop(self.john_1_1, 1))
+            self.assertEqual({self.genesis_1_1, first_john_1_1, john_1_2}, graph.k_hop(self.john_1_1, 2))
+            self.assertEqual({self.john_1_1}, graph.k_hop(first_john_1_1, 3, reverse=True))
+            self.assertEqual({self.john_1_1, john_1_2}, graph.k_hop(self.genesis_1_1, 3, reverse=True))
+
+            start = perf_counter()
+            for _ in range(1000):
+                graph.neighbours(self.john_1_1)
+            self.assertLess((perf_counter() - start) / 1000, 0.001)
+
+    def test_invalid_file(self):
+        with open(self.file_name, "wb") as graph_out:
+            graph_out.write(b"not a graph at all")
+        with self.assertRaises(ValueError):
+            CrossrefGraph(self.file_name)
+
+        for contents in (b"", b"ESVX", b"ESVX\x01\x00\x00\x00\x05\x00\x00\x00\x05\x00\x00\x00\x00"):
+            with open(self.file_name, "wb") as graph_out:
+                graph_out.write(contents)
+            with self.assertRaises(ValueError):
+                CrossrefGraph(self.file_name)
+
+    def test_fetch_resumes(self):
+        html = HTMLI(fail_at="Jude")
+        with patch('src.esv_api.crossref.RateLimiter') as limiter:
+            with self.assertRaises(PassageNotFound):
+                self.builder.fetch(html, ["3 John", "Jude", "Jonah"], rate=30)
+            limiter.assert_called_with(30)
+            self.assertEqual(2, limiter.return_value.wait.call_count)
+            html.fail_at = None
+            self.assertEqual(5, self.builder.fetch(html, ["3 John", "Jude", "Jonah"]))
+        self.assertEqual(["3 John", "Jude", "Jude", "Jonah 1", "Jonah 2", "Jonah 3", "Jonah 4"], html.queries)
+        self.assertEqual(CrossrefBuilder.CROSSREF_URL, html.options['crossref_url'])
+        self.assertEqual(6, len(self.builder))
+
+    def test_add_export(self):
+        file_name = path.join(self.directory.name, "export.ndjson")
+        Exporter(file_name, html=HTMLI(), rate=0, html_options=CrossrefBuilder.HTML_OPTIONS).run(["Jude", "Jonah"])
+        with open(file_name, "ab") as export_out:
+            export_out.write(b'{"book": "Ruth", "chap')
+        self.assertEqual(5, self.builder.add_export(file_name))
+        self.assertEqual(5, len(self.builder))
+        self.builder.write(self.file_name)
+        with CrossrefGraph(self.file_name) as graph:
+            self.assertEqual([self.genesis_1_1], graph.neighbours(self.builder.verse_id("Jonah", 4, 1)))
@@ -0,0 +1,115 @@
+from json import loads
+from os import path
+from struct import unpack
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from src.esv_api.export import Exporter
+from src.esv_api.passage import PassageNotFound
+from src.esv_api.text import Text
+import zlib
+
+
+class TextI(Text):
+    """
+    Text client that makes up chapters instead of calling the API, and fails on request
+    """
+    def __init__(self, fail_at: tuple = None) -> None:
+        super().__init__("")
+        self.fail_at = fail_at
+        self.calls = []
+
+    def get_chapter_json(self, book: str, chapter: int) -> dict:
+        if (book, chapter) == self.fail_at:
+            raise PassageNotFound("{} {}".format(book, chapter))
+        self.calls.append((book, chapter))
+        return {"book": book, "chapter": str(chapter), "verses": {"none": ["1 ..."]}, "footnotes": ""}
+
+
+class TestExport(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.output = path.join(self.directory.name, "export.ndjson")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_export_resume(self):
+        books = ["Ruth", "Jonah"]
+        with self.assertRaises(PassageNotFound):
+            Exporter(self.output, TextI(("Jonah", 2)), rate=0).run(books)
+
+        text = TextI()
+        exported = Exporter(self.output, text, rate=0).run(books)
+        self.assertEqual(8 - 4 - 1, exported)
+        self.assertNotIn(("Ruth", 1), text.calls)
+
+        with open(self.output, "r", encoding="utf-8") as output_in:
+            records = [loads(line) for line in output_in]
+        self.assertEqual(8, len(records))
+        self.assertEqual(8, len({(record["book"], record["chapter"]) for record in records}))
+        self.assertEqual("1 ...", records[0]["text"]["verses"]["none"][0])
+
+    def test_truncates_partial_record(self):
+        Exporter(self.output, TextI(), rate=0).run(["Ruth"])
+        with open(self.output, "ab") as output_out:
+            output_out.write(b'{"book":"Jonah","chap')
+        Exporter(self.output, TextI(), workers=2, rate=0).run(["Ruth", "Jonah"])
+        with open(self.output, "r", encoding="utf-8") as output_in:
+            self.assertEqual(8, len([loads(line) for line in output_in]))
+
+    def test_binary(self):
+        Exporter(self.output, TextI(), output_format="binary", workers=3, rate=0).run(["Jonah"])
+        records = []
+        with open(self.output, "rb") as output_in:
+            while True:
+                header = output_in.read(4)
+                if not header:
+                    break
+                records.append(loads(zlib.decompress(output_in.read(unpack(">I", header)[0]))))
+        self.assertEqual([1, 2, 3, 4], sorted(record["chapter"] for record in records))
+        self.assertEqual(records, list(Exporter.read(self.output, "binary")))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Exporter(self.output)
+        with self.assertRaises(ValueError):
+            Exporter(self.output, TextI(), output_format="xml")
+
+    def test_no_checkpoint(self):
+        with open(self.output, "w", encoding="utf-8") as output_out:
+            output_out.write("not an export\n")
+        with self.assertRaises(FileExistsError):
+            Exporter(self.output, TextI(), rate=0).run(["Ruth"])
+        with open(self.output, "r", encoding="utf-8") as output_in:
+            self.assertEqual("not an export\n", output_in.read())
+
+        # An empty output is fine to start on
+        empty = path.join(self.directory.name, "empty.ndjson")
+        open(empty, "w").close()
+        self.assertEqual(4, Exporter(empty, TextI(), rate=0).run(["Ruth"]))
+
+    def test_partial_checkpoint_line(self):
+        Exporter(self.output, TextI(), rate=0).run(["Ruth"])
+        size = path.getsize(self.output)
+        with open(self.output + ".checkpoint", "a", encoding="utf-8") as checkpoint_out:
+            checkpoint_out.write("4343")
+        Exporter(self.output, TextI(), rate=0).run(["Ruth", "Jonah"])
+        text = TextI()
+        self.assertEqual(0, Exporter(self.output, text, rate=0).run(["Ruth", "Jonah"]))
+        self.assertEqual([], text.calls)
+
+        with open(self.output, "rb") as output_in:
+            contents = output_in.read()
+        self.assertNotIn(b"\0", contents)
+        records = [loads(line) for line in contents.splitlines()]
+        self.assertEqual(8, len({(record["book"], record["chapter"]) for record in records}))
+        self.assertEqual(8, len(records))
+        self.assertGreater(len(contents), size)
+
+    def test_checkpoint_past_output(self):
+        Exporter(self.output, TextI(), rate=0).run(["Ruth"])
+        with open(self.output, "r+b") as output_out:
+            output_out.truncate(10)
+        with self.assertRaises(ValueError):
+            Exporter(self.output, TextI(), rate=0).run(["Ruth"])
+        self.assertEqual(10, path.getsize(self.output))
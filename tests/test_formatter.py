@@ -0,0 +1,94 @@
+from json import dumps, load
+from os import path
+from unittest import TestCase
+from unittest.mock import Mock, patch
+from src.esv_api.cache import PassageCache
+from src.esv_api.formatter import TextFormatter
+from src.esv_api.text import Text
+from tests.record_text_layouts import CASES, FIXTURES
+
+
+class TestTextFormatter(TestCase):
+    def setUp(self) -> None:
+        self.passage = ("Psalm 117\n\n"
+                        "Praise the LORD, All You Nations\n\n"
+                        "\t\t[1] Praise the LORD, all nations!\n"
+                        "\t\t\t\tExtol him, all peoples!\n"
+                        "\t\t[2] For great is his steadfast love toward us,\n"
+                        "\t\t\t\tand the faithfulness of the LORD endures forever.\n"
+                        "\t\tPraise the LORD!\n\n"
+                        "\t[3] A paragraph of prose that is long enough to wrap.\n\n"
+                        "Footnotes\n\n"
+                        "(1) 117:1 Or peoples\n")
+        self.params = dict(TextFormatter.CANONICAL_PARAMS)
+        self.params.update({'include-passage-references': True, 'horizontal-line-length': 10})
+
+    def test_canonical(self):
+        self.assertEqual(self.passage, TextFormatter.render(self.passage, self.params))
+
+    def test_layout(self):
+        self.params.update({'indent-using': 'space',
+                            'indent-paragraphs': 2,
+                            'indent-poetry-lines': 4,
+                            'include-verse-numbers': False,
+                            'include-passage-horizontal-lines': True,
+                            'line-length': 40})
+        rendered = TextFormatter.render(self.passage, self.params).split('\n')
+        self.assertEqual("=" * 10, rendered[0])
+        self.assertEqual("Psalm 117", rendered[1])
+        self.assertEqual("Praise the LORD, All You Nations", rendered[3])
+        self.assertEqual("    Praise the LORD, all nations!", rendered[5])
+        self.assertEqual("        Extol him, all peoples!", rendered[6])
+        self.assertEqual("    For great is his steadfast love", rendered[7])
+        self.assertEqual("    toward us,", rendered[8])
+        self.assertEqual("  A paragraph of prose that is long", rendered[13])
+        self.assertEqual("enough to wrap.", rendered[14])
+        self.assertIn("(1) 117:1 Or peoples", rendered)
+
+    def test_poetry_and_headings(self):
+        self.params.update({'indent-poetry': False,
+                            'include-heading-horizontal-lines': True,
+                            'include-passage-references': False})
+        rendered = TextFormatter.render(self.passage, self.params).split('\n')
+        self.assertEqual("_" * 10, rendered[0])
+        self.assertEqual("Psalm 117", rendered[1])
+        self.assertEqual("_" * 10, rendered[3])
+        self.assertEqual("[1] Praise the LORD, all nations!", rendered[6])
+
+    def test_passage_line_without_references(self):
+        passage = self.passage[self.passage.index("Praise"):]
+        self.params.update({'include-passage-references': False, 'include-passage-horizontal-lines': True})
+        rendered = TextFormatter.render(passage, self.params).split('\n')
+        self.assertEqual("=" * 10, rendered[0])
+        self.assertEqual("Praise the LORD, All You Nations", rendered[1])
+        self.assertEqual(1, rendered.count("=" * 10))
+
+        self.params['include-heading-horizontal-lines'] = True
+        rendered = TextFormatter.render(passage, self.params).split('\n')
+        self.assertEqual(["=" * 10, "_" * 10, "Praise the LORD, All You Nations"], rendered[:3])
+
+    def test_matches_api(self):
+        # Lays out passages recorded in the canonical layout locally and compares them with the API's own layout
+        if not path.exists(FIXTURES):
+            self.skipTest("No recorded layouts, run python -m tests.record_text_layouts with an API key")
+        with open(FIXTURES, "r") as fixtures_in:
+            fixtures = load(fixtures_in)
+        self.assertEqual(len(CASES), len(fixtures))
+        for fixture in fixtures:
+            with self.subTest(fixture['query'], description=fixture['description']):
+                self.assertEqual(len(fixture['expected']), len(fixture['canonical']))
+                for canonical, expected in zip(fixture['canonical'], fixture['expected']):
+                    self.assertEqual(expected.rstrip(), TextFormatter.render(canonical, fixture['params']).rstrip())
+
+    def test_text_one_request(self):
+        text = Text("", cache=PassageCache(), local_formatting=True)
+        response = Mock(status_code=200, headers={},
+                        content=dumps({'canonical': "Psalm 117", 'passages': [self.passage]}).encode())
+        with patch('src.esv_api.method.requests.get', return_value=response) as get:
+            wide = text.get_passage("Psalm 117")
+            narrow = text.get_passage("Psalm 117", line_length=40, include_verse_numbers=False)
+        self.assertEqual(1, get.call_count)
+        self.assertEqual('tab', get.call_args[1]['params']['indent-using'])
+        self.assertEqual("Psalm 117", wide[0])
+        self.assertIn("    [1] Praise the LORD, all nations!\n", wide[1]['Praise the LORD, All You Nations'])
+        self.assertIn("    Praise the LORD, all nations!\n", narrow[1]['Praise the LORD, All You Nations'])
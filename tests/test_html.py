@@ -1,6 +1,8 @@
 from unittest import TestCase
+from unittest.mock import Mock, patch
+from json import dumps
 from src.esv_api.html import HTML
-from src.esv_api.passage import PassageInvalid
+from src.esv_api.passage import PassageInvalid, PassageNotFound
 
 
 class TestHTML(TestCase):
@@ -23,3 +25,34 @@ class TestHTML(TestCase):
         response = self.html_obj.get_passage_basic("John 11:35")
         self.assertEqual(1, len(response))
         self.assertEqual(144, len(response[0]))
+
+    def test_get_passage_error_page(self):
+        error_page = Mock(status_code=502, headers={}, content=b'<html><body>502 Bad Gateway</body></html>')
+        with patch('src.esv_api.method.requests.get', return_value=error_page):
+            with self.assertRaises(PassageNotFound):
+                self.html_obj.get_passage("John 11:35")
+            with self.assertRaises(PassageNotFound):
+                HTML("", lazy_responses=True).get_passage("John 11:35")
+
+    def test_get_passage_lazy(self):
+        body = dumps({'query': "John 11:35", 'canonical': "John 11:35", 'parsed': [[43011035, 43011035]],
+                      'passage_meta': [{'canonical': "John 11:35"}], 'passages': ["<p>Jesus wept.</p>"]})
+        with patch('src.esv_api.method.requests.get', return_value=Mock(status_code=200, headers={},
+                                                                        content=body.encode())):
+            response = HTML("", lazy_responses=True).get_passage("John 11:35")
+        self.assertEqual("John 11:35", response['canonical'])
+        # The passages are checked for, but not decoded until they are read
+        self.assertNotIn('passages', list(response._LazyResponse__values))
+        self.assertEqual(["<p>Jesus wept.</p>"], response['passages'])
+
+        empty = Mock(status_code=200, headers={}, content=b'{"query": "Book 25", "canonical": "", "passages": []}')
+        with patch('src.esv_api.method.requests.get', return_value=empty):
+            with self.assertRaises(PassageInvalid):
+                HTML("", lazy_responses=True).get_passage("Book 25")
+
+    def test_get_passage_lazy_truncated(self):
+        truncated = Mock(status_code=200, headers={},
+                         content=b'{"query": "John 11:35", "canonical": "John 11:35", "passages": ["<p>Jesus')
+        with patch('src.esv_api.method.requests.get', return_value=truncated):
+            with self.assertRaises(PassageNotFound):
+                HTML("", lazy_responses=True).get_passage("John 11:35")
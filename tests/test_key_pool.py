@@ -0,0 +1,44 @@
+from unittest import TestCase
+from src.esv_api.key_pool import KeyPool
+
+
+class TestKeyPool(TestCase):
+    def setUp(self) -> None:
+        self.pool = KeyPool(["key-aaaa", "key-bbbb", "key-cccc"], quotas=((4, 60.0),), cooldown=60.0)
+
+    def test_acquire_spreads(self):
+        used = [self.pool.acquire() for _ in range(6)]
+        self.assertEqual(2, used.count("key-aaaa"))
+        self.assertEqual(2, used.count("key-bbbb"))
+        self.assertEqual(2, used.count("key-cccc"))
+        self.assertEqual([2, 2, 2], [stats['remaining'] for stats in self.pool.stats])
+
+    def test_record(self):
+        self.pool.record("key-aaaa", 401)
+        self.pool.record("key-bbbb", 429, "120")
+        self.pool.record("key-cccc", 200)
+        self.assertEqual(["key-cccc"] * 5, [self.pool.acquire() for _ in range(5)])
+
+        stats = self.pool.stats
+        self.assertEqual(['aaaa', 'bbbb', 'cccc'], [key_stats['key'] for key_stats in stats])
+        self.assertFalse(stats[0]['available'])
+        self.assertEqual(1, stats[1]['rejections'])
+        self.assertGreater(stats[1]['disabled_for'], 60.0)
+        self.assertEqual(5, stats[2]['requests'])
+        self.assertEqual(0, stats[2]['remaining'])
+
+    def test_all_disabled(self):
+        self.pool.record("key-aaaa", 429, "30")
+        self.pool.record("key-bbbb", 429, "10")
+        self.pool.record("key-cccc", 429, "20")
+        self.assertEqual("key-bbbb", self.pool.acquire())
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            KeyPool([])
+
+    def test_available(self):
+        self.assertEqual(3, self.pool.available)
+        self.pool.record("key-aaaa", 403)
+        self.pool.record("key-bbbb", 500)
+        self.assertEqual(2, self.pool.available)
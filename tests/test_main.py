@@ -0,0 +1,77 @@
+from io import StringIO
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+from src.esv_api.__main__ import main, parse_args
+from src.esv_api.crossref import CrossrefBuilder
+from src.esv_api.key_pool import KeyPool
+
+
+class TestMain(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.output = path.join(self.directory.name, "export.ndjson")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_parse_args(self):
+        args = parse_args(["export", self.output, "--key", "a", "--key", "b", "--book", "Ruth", "--format", "binary"])
+        self.assertEqual("export", args.command)
+        self.assertEqual(["a", "b"], args.key)
+        self.assertEqual(["Ruth"], args.books)
+        self.assertEqual("binary", args.output_format)
+        self.assertEqual("text", args.content)
+
+        with patch('sys.stderr', new_callable=StringIO), self.assertRaises(SystemExit):
+            parse_args(["export", self.output, "--format", "xml"])
+
+    def test_key_file(self):
+        key_file = path.join(self.directory.name, "key.txt")
+        with open(key_file, "w") as key_out:
+            key_out.write("file-key\n")
+        with patch('src.esv_api.__main__.Text') as text, patch('src.esv_api.__main__.Exporter') as exporter:
+            exporter.return_value.run.return_value = 4
+            with patch('sys.stdout', new_callable=StringIO):
+                self.assertEqual(0, main(["export", self.output, "--key-file", key_file, "--book", "Ruth"]))
+        text.assert_called_once_with("file-key")
+        exporter.return_value.run.assert_called_once_with(["Ruth"])
+
+    def test_key_pool(self):
+        with patch('src.esv_api.__main__.Text') as text, patch('src.esv_api.__main__.HTML') as html, \
+                patch('src.esv_api.__main__.Exporter') as exporter:
+            exporter.return_value.run.return_value = 0
+            with patch('sys.stdout', new_callable=StringIO):
+                self.assertEqual(0, main(["export", self.output, "--key", "a", "--key", "b", "--content", "both"]))
+        pool = text.call_args[0][0]
+        self.assertIsInstance(pool, KeyPool)
+        self.assertEqual(2, len(pool))
+        self.assertIs(pool, html.call_args[0][0])
+
+    def test_unknown_book(self):
+        with patch('src.esv_api.__main__.Exporter') as exporter, patch('sys.stderr', new_callable=StringIO) as err:
+            self.assertEqual(2, main(["export", self.output, "--key", "a", "--book", "Book"]))
+        self.assertIn("Unknown book Book", err.getvalue())
+        exporter.assert_not_called()
+
+    def test_existing_output(self):
+        with open(self.output, "w") as output_out:
+            output_out.write("not an export\n")
+        with patch('sys.stderr', new_callable=StringIO) as err:
+            self.assertEqual(2, main(["export", self.output, "--key", "a", "--book", "Ruth"]))
+        self.assertIn("no checkpoint", err.getvalue())
+
+    def test_missing_key_file(self):
+        key_file = path.join(self.directory.name, "missing.txt")
+        with patch('sys.stderr', new_callable=StringIO) as err:
+            self.assertEqual(2, main(["export", self.output, "--key-file", key_file]))
+        self.assertIn(key_file, err.getvalue())
+        self.assertIn("--key", err.getvalue())
+
+    def test_crossrefs(self):
+        with patch('src.esv_api.__main__.HTML'), patch('src.esv_api.__main__.Exporter') as exporter:
+            exporter.return_value.run.return_value = 0
+            with patch('sys.stdout', new_callable=StringIO):
+                self.assertEqual(0, main(["export", self.output, "--key", "a", "--content", "html", "--crossrefs"]))
+        self.assertEqual(CrossrefBuilder.HTML_OPTIONS, exporter.call_args[1]['html_options'])
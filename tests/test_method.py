@@ -1,10 +1,16 @@
+from time import sleep
 from unittest import TestCase
+from unittest.mock import Mock, patch
+from src.esv_api.breaker import CircuitBreaker, CircuitOpen
+from src.esv_api.cache import PassageCache
+from src.esv_api.key_pool import KeyPool
+import requests
 from src.esv_api.method import Method
 
 
 class MethodI(Method):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, cache: PassageCache = None, breaker: CircuitBreaker = None) -> None:
+        super().__init__(cache, breaker)
 
 
 class TestMethod(TestCase):
@@ -38,3 +44,90 @@ class TestMethod(TestCase):
                           '1 Timothy': 6, '2 Timothy': 4, 'Titus': 3, 'Philemon': 1, 'Hebrews': 13, 'James': 5,
                           '1 Peter': 5, '2 Peter': 3, '1 John': 5, '2 John': 1, '3 John': 1, 'Jude': 1,
                           'Revelation': 22}, self.bible.books_of_the_bible)
+
+    def test_get_conditional(self):
+        cache = PassageCache(soft_ttl=0.01, jitter=0)
+        bible = MethodI(cache)
+        fresh = Mock(status_code=200, content=b'{}', headers={'ETag': '"v1"'})
+        not_modified = Mock(status_code=304, content=b'', headers={})
+        with patch('src.esv_api.method.requests.get', side_effect=[fresh, not_modified]) as get:
+            self.assertEqual((b'{}', False), bible._get("https://api.esv.org/", {'q': "John 1"}, "key"))
+            self.assertEqual((b'{}', False), bible._get("https://api.esv.org/", {'q': "John 1"}, "key"))
+            sleep(0.02)
+            # Stale: served from the cache while revalidating in the background
+            self.assertEqual((b'{}', False), bible._get("https://api.esv.org/", {'q': "John 1"}, "key"))
+            for _ in range(100):
+                if get.call_count == 2:
+                    break
+                sleep(0.01)
+            self.assertEqual(2, get.call_count)
+            self.assertEqual('"v1"', get.call_args[1]['headers']['If-None-Match'])
+
+    def test_get_degraded(self):
+        cache = PassageCache(hard_ttl=0.01, jitter=0)
+        bible = MethodI(cache, CircuitBreaker(window=1, min_calls=1))
+        fresh = Mock(status_code=200, content=b'{}', headers={})
+        with patch('src.esv_api.method.requests.get', side_effect=[fresh, requests.ConnectionError()]) as get:
+            bible._get("https://api.esv.org/", {'q': "John 1"}, "key")
+            sleep(0.02)
+            with self.assertRaises(requests.ConnectionError):
+                bible._get("https://api.esv.org/", {'q': "John 1"}, "key")
+            # The circuit is now open: expired entries are served as degraded, others fail fast
+            self.assertEqual((b'{}', True), bible._get("https://api.esv.org/", {'q': "John 1"}, "key"))
+            with self.assertRaises(CircuitOpen):
+                bible._get("https://api.esv.org/", {'q': "John 2"}, "key")
+            self.assertEqual(2, get.call_count)
+
+    def test_verse_id(self):
+        self.assertEqual(43011035, self.bible.verse_id("John", 11, 35))
+        self.assertEqual(1001001, self.bible.verse_id("Genesis", 1, 1))
+        self.assertEqual(66022021, self.bible.verse_id("Revelation", 22, 21))
+        self.assertEqual(0, self.bible.verse_id("Book", 1, 1))
+
+    def test_verse_count(self):
+        self.assertEqual(51, self.bible.verse_count("John", 1))
+        self.assertEqual(176, self.bible.verse_count("Psalm", 119))
+        self.assertEqual(15, self.bible.verse_count("3 John", 1))
+        self.assertEqual(0, self.bible.verse_count("John", 22))
+        self.assertEqual(0, self.bible.verse_count("Book", 1))
+        for book, chapters in self.bible.books_of_the_bible.items():
+            self.assertTrue(all(self.bible.verse_count(book, chapter) for chapter in range(1, chapters + 1)), book)
+
+    def test_get_json(self):
+        error = Mock(status_code=502, headers={}, content=b'<html>502 Bad Gateway</html>')
+        with patch('src.esv_api.method.requests.get', return_value=error):
+            with self.assertRaises(KeyError):
+                self.bible._get_json("https://api.esv.org/", {'q': "John 1"}, "key", KeyError("John 1"))
+        found = Mock(status_code=200, headers={}, content=b'{"passages": ["In the beginning"]}')
+        with patch('src.esv_api.method.requests.get', return_value=found):
+            self.assertEqual(({'passages': ["In the beginning"]}, False),
+                             self.bible._get_json("https://api.esv.org/", {'q': "John 1"}, "key", KeyError(),
+                                                  required='passages'))
+            self.assertEqual((None, False), self.bible._get_json("https://api.esv.org/", {'q': "John 1"}, "key",
+                                                                 KeyError(), lazy=True, required='parsed'))
+
+    def test_request_timeout(self):
+        bible = MethodI(breaker=CircuitBreaker(window=1, min_calls=1))
+        with patch('src.esv_api.method.requests.get', side_effect=requests.Timeout()) as get:
+            with self.assertRaises(requests.Timeout):
+                bible._request("https://api.esv.org/", {'q': "John 1"}, "key")
+            # A hung API times out by default, and the timeout counts as a failure
+            self.assertEqual(10.0, get.call_args[1]['timeout'])
+            with self.assertRaises(CircuitOpen):
+                bible._request("https://api.esv.org/", {'q': "John 1"}, "key")
+
+    def test_request_key_pool_retry(self):
+        pool = KeyPool(["aaaa1", "bbbb2"])
+        throttled = Mock(status_code=429, headers={}, content=b'{"detail": "Request was throttled."}')
+        found = Mock(status_code=200, headers={}, content=b'{"passages": ["Jesus wept."]}')
+        with patch('src.esv_api.method.requests.get', side_effect=[throttled, found]) as get:
+            self.assertIs(found, self.bible._request("https://api.esv.org/", {'q': "John 11:35"}, pool))
+        self.assertEqual(['Token aaaa1', 'Token bbbb2'],
+                         [call[1]['headers']['Authorization'] for call in get.call_args_list])
+        self.assertEqual(1, pool.available)
+
+        # Once every key is set aside, the rejection is returned
+        with patch('src.esv_api.method.requests.get', return_value=throttled) as get:
+            self.assertIs(throttled, self.bible._request("https://api.esv.org/", {'q': "John 11:35"}, pool))
+        self.assertEqual(1, get.call_count)
+        self.assertEqual(0, pool.available)
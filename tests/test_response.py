@@ -0,0 +1,91 @@
+from json import dumps, loads
+from unittest import TestCase
+from src.esv_api.response import LazyResponse
+
+
+class TestLazyResponse(TestCase):
+    def setUp(self) -> None:
+        self.response = {'query': "John 11:35",
+                         'canonical': "John 11:35",
+                         'parsed': [[43011035, 43011035]],
+                         'passage_meta': [{'canonical': "John 11:35", 'chapter_start': [43011001, 43011057],
+                                           'prev_chapter': None, 'tricky': "a \"quoted\", {bracketed} [string]"}],
+                         'passages': ["<p>Jesus wept.</p>\n"],
+                         'empty': {}}
+        self.lazy = LazyResponse(dumps(self.response, indent=1).encode())
+
+    def test_dict_compatible(self):
+        self.assertEqual("John 11:35", self.lazy['canonical'])
+        self.assertEqual(self.response['passage_meta'], self.lazy['passage_meta'])
+        self.assertEqual(list(self.response), list(self.lazy))
+        self.assertEqual(len(self.response), len(self.lazy))
+        self.assertIn('passages', self.lazy)
+        self.assertNotIn('missing', self.lazy)
+        self.assertIsNone(self.lazy.get('missing'))
+        self.assertEqual(self.response, self.lazy)
+        self.assertEqual(self.response, dict(self.lazy))
+        with self.assertRaises(KeyError):
+            _ = self.lazy['missing']
+
+    def test_lazy(self):
+        # Fields after the one read are never decoded, so a broken field goes unnoticed
+        lazy = LazyResponse(b'{"query": "John 11:35", "canonical": "John 11:35", "passages": [}')
+        self.assertEqual("John 11:35", lazy['canonical'])
+        with self.assertRaises(ValueError):
+            _ = lazy['passages']
+
+    def test_has_items(self):
+        # The field checked is not decoded, so a broken field goes unnoticed
+        lazy = LazyResponse(b'{"query": "John 11:35", "canonical": "John 11:35", "passages": ["<p>Jesus wept}')
+        self.assertTrue(lazy.has_items('passages'))
+        self.assertEqual("John 11:35", lazy['canonical'])
+        with self.assertRaises(ValueError):
+            _ = lazy['passages']
+
+        lazy = LazyResponse(b'{"empty": [ ], "none": null, "zero": 0, "blank": "", "full": {"a": 1}, "one": 1}')
+        self.assertFalse(lazy.has_items('zero'))
+        self.assertFalse(lazy.has_items('empty'))
+        self.assertFalse(lazy.has_items('none'))
+        self.assertFalse(lazy.has_items('blank'))
+        self.assertTrue(lazy.has_items('full'))
+        self.assertTrue(lazy.has_items('one'))
+        self.assertFalse(lazy.has_items('missing'))
+        self.assertEqual(6, len(lazy))
+        self.assertTrue(self.lazy.has_items('passages'))
+
+    def test_truncated(self):
+        # A body cut short is caught before any field is read
+        lazy = LazyResponse(b'{"query": "John 11:35", "canonical": "John 11:35", "passages": ["<p>Jesus wept')
+        with self.assertRaises(ValueError):
+            _ = lazy['query']
+        with self.assertRaises(ValueError):
+            lazy.has_items('passages')
+
+    def test_dict_methods(self):
+        copy = self.lazy.copy()
+        self.assertIs(dict, type(copy))
+        self.assertEqual(self.response, copy)
+        self.assertEqual(self.response, loads(dumps(self.lazy.to_dict())))
+        self.assertEqual(dict(self.response, degraded=True), self.lazy | {'degraded': True})
+        self.assertEqual(dict(self.response, degraded=True), {'degraded': True, 'query': ""} | self.lazy)
+        self.assertEqual(list(reversed(list(self.response))), list(reversed(self.lazy)))
+        self.lazy |= {'degraded': True}
+        self.assertTrue(self.lazy['degraded'])
+
+    def test_mutable(self):
+        self.lazy['degraded'] = True
+        self.assertTrue(self.lazy['degraded'])
+        del self.lazy['parsed']
+        self.assertNotIn('parsed', self.lazy)
+        self.assertEqual(6, len(self.lazy))
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            self.lazy.anything = 1
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            _ = LazyResponse(b'[1, 2]')['passages']
+        with self.assertRaises(ValueError):
+            _ = len(LazyResponse(b'{"passages": ['))
+        self.assertEqual(0, len(LazyResponse(b'{}')))
@@ -1,5 +1,20 @@
+from json import dumps
 from unittest import TestCase
-from src.esv_api.search import Search, SearchInvalid
+from unittest.mock import Mock, patch
+from src.esv_api.cache import PassageCache
+from src.esv_api.search import Search, SearchError, SearchInvalid
+
+
+def upstream_page(url: str, params: dict, headers: dict, timeout: float = None) -> Mock:
+    """
+    Stands in for the API with 652 results, served in pages of params['page-size']
+    """
+    first = (params['page'] - 1) * params['page-size']
+    results = [{'reference': str(i), 'content': ""} for i in range(first, min(first + params['page-size'], 652))]
+    return Mock(status_code=200, headers={}, content=dumps({'page': params['page'],
+                                                            'total_results': 652,
+                                                            'results': results,
+                                                            'total_pages': -(-652 // params['page-size'])}).encode())
 
 
 class TestSearch(TestCase):
@@ -31,3 +46,64 @@ class TestSearch(TestCase):
 
         with self.assertRaises(SearchInvalid):
             self.search_obj.search("a query!", page_size=101)
+
+    def test_search_cached_pages(self):
+        search_obj = Search("", cache=PassageCache())
+        with patch('src.esv_api.method.requests.get', side_effect=upstream_page) as get:
+            result = search_obj.search("love", page_size=10, page=3)
+            self.assertEqual(3, result['page'])
+            self.assertEqual(66, result['total_pages'])
+            self.assertEqual(652, result['total_results'])
+            self.assertEqual([str(i) for i in range(20, 30)], [r['reference'] for r in result['results']])
+            self.assertEqual(1, get.call_count)
+
+            # Straddles upstream pages 1 and 2; only page 2 is fetched
+            result = search_obj.search("love", page_size=30, page=4)
+            self.assertEqual([str(i) for i in range(90, 120)], [r['reference'] for r in result['results']])
+            self.assertEqual(22, result['total_pages'])
+            self.assertEqual(2, get.call_count)
+
+            result = search_obj.search("love", page_size=100, page=7)
+            self.assertEqual(52, len(result['results']))
+            self.assertEqual(3, get.call_count)
+
+            for page in range(1, 5):
+                search_obj.search("love", page_size=25, page=page)
+            self.assertEqual(3, get.call_count)
+
+
+    def test_search_error_page(self):
+        with patch('src.esv_api.method.requests.get',
+                   return_value=Mock(status_code=502, headers={}, content=b'<html>502 Bad Gateway</html>')):
+            with self.assertRaises(SearchError):
+                self.search_obj.search("love")
+            with self.assertRaises(SearchError):
+                Search("", cache=PassageCache()).search("love")
+
+    def test_search_cached_pages_error(self):
+        throttled = Mock(status_code=429, headers={}, content=b'{"detail": "Request was throttled."}')
+        with patch('src.esv_api.method.requests.get', return_value=throttled):
+            with self.assertRaisesRegex(SearchError, "throttled"):
+                Search("", cache=PassageCache()).search("love")
+
+    def test_search_cached_pages_out_of_range(self):
+        few = Mock(status_code=200, headers={}, content=dumps({'page': 1, 'total_results': 3, 'total_pages': 1,
+                                                               'results': [{'reference': "John 11:35",
+                                                                            'content': "Jesus wept."}] * 3}).encode())
+        with patch('src.esv_api.method.requests.get', return_value=few) as get:
+            result = Search("", cache=PassageCache()).search("Jesus wept", 20, 6)
+        self.assertEqual(3, result['total_results'])
+        self.assertEqual(1, result['total_pages'])
+        self.assertEqual([], result['results'])
+        self.assertEqual(1, get.call_count)
+        self.assertEqual(1, get.call_args[1]['params']['page'])
+
+    def test_search_invalid_page(self):
+        search_obj = Search("", cache=PassageCache())
+        with patch('src.esv_api.method.requests.get', side_effect=upstream_page) as get:
+            for page_size, page in ((20, 0), (20, -1), (0, 1)):
+                with self.assertRaises(SearchInvalid):
+                    search_obj.search("love", page_size, page)
+                with self.assertRaises(SearchInvalid):
+                    self.search_obj.search("love", page_size, page)
+        get.assert_not_called()
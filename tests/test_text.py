@@ -1,4 +1,7 @@
 from unittest import TestCase
+from unittest.mock import Mock, patch
+from src.esv_api.key_pool import KeyPool
+from src.esv_api.passage import PassageNotFound
 from src.esv_api.text import Text
 
 
@@ -23,3 +26,17 @@ class TestText(TestCase):
         passage = self.text_obj.get_passage("John 11:35")
         self.assertEqual("John 11:35", passage[0])
         self.assertEqual("  [35] Jesus wept.\n", passage[1]['none'])
+
+    def test_get_passage_error_page(self):
+        error_page = Mock(status_code=502, headers={}, content=b'<html><body>502 Bad Gateway</body></html>')
+        with patch('src.esv_api.method.requests.get', return_value=error_page):
+            with self.assertRaises(PassageNotFound):
+                self.text_obj.get_passage("John 11:35")
+
+    def test_get_passage_key_pool(self):
+        throttled = Mock(status_code=429, headers={}, content=b'{"detail": "Request was throttled."}')
+        found = Mock(status_code=200, headers={}, content=b'{"canonical": "John 11:35", '
+                                                          b'"passages": ["  [35] Jesus wept.\\n"]}')
+        with patch('src.esv_api.method.requests.get', side_effect=[throttled, found]):
+            passage = Text(KeyPool(["aaaa1", "bbbb2"])).get_passage("John 11:35")
+        self.assertEqual("John 11:35", passage[0])